@@ -1,13 +1,164 @@
-from flask import Flask, render_template_string, request, jsonify, redirect, url_for
+from flask import Blueprint, Flask, Response, render_template, request, jsonify, g
+from markupsafe import Markup
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import gzip
+import hashlib
+import json
+import mimetypes
 import sqlite3
-from datetime import datetime, date
+from datetime import datetime, date, timezone
 import os
+import queue
+import random
+import re
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import brotli
+except ImportError:  # brotli variants are skipped without it
+    brotli = None
+
+import migrate_db
+import watering_schedule
 
 app = Flask(__name__)
 app.config['DATABASE'] = os.environ.get('DATABASE_PATH', 'garden.db')
 app.config['PERENUAL_API_KEY'] = os.environ.get('PERENUAL_API_KEY', '')
 
+# SQLite connection pool and tuning (DB_POOL_SIZE=0 restores connect-per-request)
+app.config['DB_POOL_SIZE'] = int(os.environ.get('DB_POOL_SIZE', 8))
+app.config['DB_CACHE_SIZE_KB'] = int(os.environ.get('DB_CACHE_SIZE_KB', 16384))
+app.config['DB_MMAP_SIZE'] = int(os.environ.get('DB_MMAP_SIZE', 128 * 1024 * 1024))
+app.config['DB_BUSY_TIMEOUT_MS'] = int(os.environ.get('DB_BUSY_TIMEOUT_MS', 5000))
+
+# Hosted gardens: every garden but the default one keeps its plants and beds
+# in its own SQLite file, GARDENS_DIR/<garden_id>.db, served under
+# /gardens/<garden_id>/. Connection pools for the most recently used
+# GARDEN_POOL_LIMIT gardens stay open.
+app.config['GARDENS_DIR'] = os.environ.get(
+    'GARDENS_DIR', os.path.join(os.path.dirname(app.config['DATABASE']), 'gardens')
+)
+app.config['GARDEN_POOL_LIMIT'] = int(os.environ.get('GARDEN_POOL_LIMIT', 64))
+
+# JSON plant listing page sizes
+app.config['PLANTS_PAGE_SIZE'] = int(os.environ.get('PLANTS_PAGE_SIZE', 100))
+app.config['PLANTS_MAX_PAGE_SIZE'] = int(os.environ.get('PLANTS_MAX_PAGE_SIZE', 1000))
+
+# Rendered bed and plant-card fragments kept in memory
+app.config['FRAGMENT_CACHE_SIZE'] = int(os.environ.get('FRAGMENT_CACHE_SIZE', 20000))
+
+# Server-Sent Events change stream
+app.config['EVENT_HISTORY_SIZE'] = int(os.environ.get('EVENT_HISTORY_SIZE', 1000))
+app.config['EVENT_HEARTBEAT_SECONDS'] = float(os.environ.get('EVENT_HEARTBEAT_SECONDS', 15))
+
+# Outbound HTTP: pooled keep-alive sessions that retry upstream calls; Perenual
+# lookups also get one overall deadline (see perenual_get)
+app.config['PERENUAL_BASE_URL'] = os.environ.get('PERENUAL_BASE_URL', 'https://perenual.com/api').rstrip('/')
+app.config['HTTP_POOL_SIZE'] = int(os.environ.get('HTTP_POOL_SIZE', 10))
+app.config['HTTP_CONNECT_TIMEOUT'] = float(os.environ.get('HTTP_CONNECT_TIMEOUT', 3.05))
+app.config['HTTP_READ_TIMEOUT'] = float(os.environ.get('HTTP_READ_TIMEOUT', 5))
+app.config['HTTP_RETRIES'] = int(os.environ.get('HTTP_RETRIES', 2))
+app.config['HTTP_BACKOFF_FACTOR'] = float(os.environ.get('HTTP_BACKOFF_FACTOR', 0.5))
+# Longest a single Perenual lookup may take, rate-limit wait and retries included
+app.config['PERENUAL_DEADLINE_SECONDS'] = float(os.environ.get('PERENUAL_DEADLINE_SECONDS', 10))
+
+# Perenual calls go through a circuit breaker that fails fast
+# after repeated errors or slow responses
+app.config['PERENUAL_BREAKER_FAILURES'] = int(os.environ.get('PERENUAL_BREAKER_FAILURES', 5))
+app.config['PERENUAL_BREAKER_SLOW_SECONDS'] = float(os.environ.get('PERENUAL_BREAKER_SLOW_SECONDS', 3))
+app.config['PERENUAL_BREAKER_RESET_SECONDS'] = float(os.environ.get('PERENUAL_BREAKER_RESET_SECONDS', 30))
+
+# Client-side limits on Perenual usage: a token bucket smooths bursts, and a
+# daily budget (persisted in app_meta) keeps us inside the key's quota
+app.config['PERENUAL_RATE_PER_SECOND'] = float(os.environ.get('PERENUAL_RATE_PER_SECOND', 1))
+if app.config['PERENUAL_RATE_PER_SECOND'] <= 0:
+    raise ValueError('PERENUAL_RATE_PER_SECOND must be positive')
+app.config['PERENUAL_RATE_BURST'] = int(os.environ.get('PERENUAL_RATE_BURST', 5))
+app.config['PERENUAL_RATE_WAIT_SECONDS'] = float(os.environ.get('PERENUAL_RATE_WAIT_SECONDS', 2))
+app.config['PERENUAL_DAILY_BUDGET'] = int(os.environ.get('PERENUAL_DAILY_BUDGET', 100))  # 0 means unlimited
+app.config['PERENUAL_BUDGET_RESERVE'] = int(os.environ.get('PERENUAL_BUDGET_RESERVE', 5))
+
+# Background workers that fill in Perenual metadata for plants saved with only a perenual_id
+app.config['ENRICHMENT_WORKERS'] = int(os.environ.get('ENRICHMENT_WORKERS', 2))
+app.config['ENRICHMENT_MAX_ATTEMPTS'] = int(os.environ.get('ENRICHMENT_MAX_ATTEMPTS', 5))
+app.config['ENRICHMENT_RETRY_SECONDS'] = float(os.environ.get('ENRICHMENT_RETRY_SECONDS', 30))
+
+# Speculative details lookups for the top search results, held briefly in memory
+app.config['PERENUAL_PREFETCH_DETAILS'] = int(os.environ.get('PERENUAL_PREFETCH_DETAILS', 0))  # 0 disables
+app.config['PERENUAL_PREFETCH_WORKERS'] = int(os.environ.get('PERENUAL_PREFETCH_WORKERS', 4))
+app.config['PERENUAL_PREFETCH_TTL'] = float(os.environ.get('PERENUAL_PREFETCH_TTL', 300))
+
+# Perenual species search cache (stored in the garden database)
+app.config['PERENUAL_SEARCH_CACHE_TTL'] = int(os.environ.get('PERENUAL_SEARCH_CACHE_TTL', 7 * 24 * 3600))
+app.config['PERENUAL_SEARCH_CACHE_SIZE'] = int(os.environ.get('PERENUAL_SEARCH_CACHE_SIZE', 5000))
+
+# Where species searches are answered: 'online' (Perenual), 'catalog' (the
+# local species catalog only) or 'auto' (catalog first, Perenual for the rest)
+app.config['PERENUAL_SEARCH_MODE'] = os.environ.get('PERENUAL_SEARCH_MODE', 'auto')
+
+# Perenual species details: served from cache, refreshed in the background once stale
+app.config['PERENUAL_DETAILS_FRESH_SECONDS'] = int(os.environ.get('PERENUAL_DETAILS_FRESH_SECONDS', 30 * 24 * 3600))
+
+# Admin endpoints are disabled unless a token is configured
+app.config['ADMIN_TOKEN'] = os.environ.get('ADMIN_TOKEN', '')
+
+# Dashboard weather, fetched server-side from Open-Meteo and shared by every viewer
+app.config['WEATHER_BASE_URL'] = os.environ.get('WEATHER_BASE_URL', 'https://api.open-meteo.com/v1').rstrip('/')
+app.config['WEATHER_LATITUDE'] = float(os.environ.get('WEATHER_LATITUDE', 34.6876))
+app.config['WEATHER_LONGITUDE'] = float(os.environ.get('WEATHER_LONGITUDE', -77.1192))
+app.config['WEATHER_LOCATION_NAME'] = os.environ.get('WEATHER_LOCATION_NAME', 'Swansboro, NC')
+app.config['WEATHER_TIMEZONE'] = os.environ.get('WEATHER_TIMEZONE', 'America/New_York')
+app.config['WEATHER_REFRESH_SECONDS'] = int(os.environ.get('WEATHER_REFRESH_SECONDS', 600))
+app.config['WEATHER_GRID_DEGREES'] = float(os.environ.get('WEATHER_GRID_DEGREES', 0.05))
+# Rain days with at least this much precipitation count as a watering (0 turns rain credit off)
+app.config['WEATHER_RAIN_CREDIT_INCHES'] = float(os.environ.get('WEATHER_RAIN_CREDIT_INCHES', 0.5))
+app.config['WEATHER_HISTORY_DAYS'] = int(os.environ.get('WEATHER_HISTORY_DAYS', 7))
+app.config['WEATHER_FORECAST_DAYS'] = int(os.environ.get('WEATHER_FORECAST_DAYS', 3))
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+
+# Far-future caching is safe because asset URLs change whenever their content does
+ASSET_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+class StaticAsset:
+    """A static file fingerprinted by content hash, with precompressed variants"""
+
+    def __init__(self, name, content):
+        self.name = name
+        self.digest = hashlib.sha256(content).hexdigest()[:12]
+        stem, ext = os.path.splitext(name)
+        self.url_name = f'{stem}.{self.digest}{ext}'
+        self.mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        self.variants = {'identity': content, 'gzip': gzip.compress(content, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            self.variants['br'] = brotli.compress(content, quality=11)
+
+def load_assets(directory):
+    """Fingerprint and compress every file in the static directory"""
+    assets = {}
+    if os.path.isdir(directory):
+        for name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, name)
+            if os.path.isfile(path):
+                with open(path, 'rb') as f:
+                    assets[name] = StaticAsset(name, f.read())
+    return assets
+
+ASSETS = load_assets(STATIC_DIR)
+ASSETS_BY_URL = {asset.url_name: asset for asset in ASSETS.values()}
+
+def asset_url(name):
+    """Fingerprinted URL for a static asset"""
+    return f'/assets/{ASSETS[name].url_name}'
+
+app.jinja_env.globals['asset_url'] = asset_url
+
 # HTML Template
 HTML_TEMPLATE = '''
 <!DOCTYPE html>
@@ -16,497 +167,9 @@ HTML_TEMPLATE = '''
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>🌱 Garden Tracker</title>
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            background:
-                linear-gradient(rgba(240, 253, 244, 0.92), rgba(220, 252, 231, 0.92)),
-                url('https://images.unsplash.com/photo-1464226184884-fa280b87c399?w=1600&q=80') center/cover fixed;
-            min-height: 100vh;
-            padding: 20px;
-        }
-        .container {
-            max-width: 1200px;
-            margin: 0 auto;
-        }
-        .header {
-            background: linear-gradient(135deg, #15803d 0%, #16a34a 100%);
-            color: white;
-            padding: 30px;
-            border-radius: 16px;
-            margin-bottom: 30px;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            box-shadow: 0 8px 20px rgba(21, 128, 61, 0.3);
-            backdrop-filter: blur(10px);
-        }
-        h1 {
-            font-size: 2em;
-        }
-        .btn {
-            background: #22c55e;
-            color: white;
-            border: none;
-            padding: 12px 24px;
-            border-radius: 8px;
-            cursor: pointer;
-            font-size: 16px;
-            font-weight: 600;
-            transition: background 0.3s;
-        }
-        .btn:hover {
-            background: #16a34a;
-        }
-        .btn-water {
-            background: #3b82f6;
-            padding: 8px 16px;
-            font-size: 14px;
-            width: 100%;
-        }
-        .btn-water:hover {
-            background: #2563eb;
-        }
-        .btn-edit {
-            background: #f59e0b;
-            padding: 6px 12px;
-            font-size: 14px;
-        }
-        .btn-edit:hover {
-            background: #d97706;
-        }
-        .btn-delete {
-            background: #ef4444;
-            padding: 6px 12px;
-            font-size: 14px;
-        }
-        .btn-delete:hover {
-            background: #dc2626;
-        }
-        .modal {
-            display: none;
-            position: fixed;
-            top: 0;
-            left: 0;
-            width: 100%;
-            height: 100%;
-            background: rgba(0,0,0,0.5);
-            z-index: 1000;
-            overflow-y: auto;
-        }
-        .modal-content {
-            background: rgba(255, 255, 255, 0.98);
-            max-width: 500px;
-            margin: 20px auto;
-            padding: 30px;
-            border-radius: 16px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.25);
-            backdrop-filter: blur(10px);
-            border: 1px solid rgba(255, 255, 255, 0.3);
-        }
-        .modal h2 {
-            margin-bottom: 20px;
-            color: #16a34a;
-        }
-        .form-group {
-            margin-bottom: 15px;
-        }
-        .form-group label {
-            display: block;
-            margin-bottom: 5px;
-            font-weight: 600;
-            color: #374151;
-        }
-        .form-group input {
-            width: 100%;
-            padding: 10px;
-            border: 2px solid #d1d5db;
-            border-radius: 6px;
-            font-size: 14px;
-        }
-        .form-group input:focus {
-            outline: none;
-            border-color: #16a34a;
-        }
-        .form-actions {
-            display: flex;
-            gap: 10px;
-            margin-top: 20px;
-        }
-        .btn-cancel {
-            background: #6b7280;
-            flex: 1;
-        }
-        .btn-cancel:hover {
-            background: #4b5563;
-        }
-        .btn-submit {
-            flex: 1;
-        }
-        .plants-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fill, minmax(300px, 1fr));
-            gap: 20px;
-        }
-        .plant-card {
-            background: rgba(255, 255, 255, 0.98);
-            border-radius: 12px;
-            padding: 20px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-            transition: transform 0.2s, box-shadow 0.2s;
-            border: 1px solid rgba(22, 163, 74, 0.1);
-        }
-        .plant-card:hover {
-            transform: translateY(-4px);
-            box-shadow: 0 4px 12px rgba(0,0,0,0.15);
-        }
-        .plant-header {
-            display: flex;
-            justify-content: space-between;
-            align-items: start;
-            margin-bottom: 15px;
-        }
-        .plant-name {
-            font-size: 1.3em;
-            font-weight: bold;
-            color: #16a34a;
-        }
-        .plant-type {
-            color: #6b7280;
-            font-size: 0.9em;
-        }
-        .plant-details {
-            margin: 15px 0;
-            color: #374151;
-            font-size: 0.9em;
-            line-height: 1.8;
-        }
-        .plant-detail {
-            display: flex;
-            align-items: center;
-            gap: 8px;
-        }
-        .empty-state {
-            text-align: center;
-            padding: 60px 20px;
-            color: #6b7280;
-            font-size: 1.1em;
-        }
-        .garden-grid-section {
-            background: rgba(255, 255, 255, 0.95);
-            border-radius: 16px;
-            padding: 30px;
-            margin-bottom: 30px;
-            box-shadow: 0 4px 15px rgba(0,0,0,0.15);
-            backdrop-filter: blur(10px);
-            border: 1px solid rgba(255, 255, 255, 0.3);
-        }
-        .garden-grid-section h2 {
-            color: #16a34a;
-            margin-bottom: 20px;
-            font-size: 1.5em;
-        }
-        .garden-layout {
-            display: grid;
-            grid-template-columns: repeat(3, 1fr);
-            gap: 15px;
-            max-width: 900px;
-            margin: 0 auto;
-        }
-        .garden-bed {
-            aspect-ratio: 2/1;
-            background: linear-gradient(135deg, #84cc16 0%, #a3e635 100%);
-            border-radius: 8px;
-            padding: 15px;
-            position: relative;
-            cursor: pointer;
-            transition: transform 0.2s, box-shadow 0.2s;
-            border: 3px solid #65a30d;
-            overflow: hidden;
-        }
-        .garden-bed:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 4px 12px rgba(101, 163, 13, 0.3);
-        }
-        .garden-bed.has-plants {
-            background: linear-gradient(135deg, #16a34a 0%, #22c55e 100%);
-            border-color: #15803d;
-        }
-        .bed-label {
-            position: absolute;
-            top: 8px;
-            left: 8px;
-            background: rgba(255,255,255,0.9);
-            padding: 4px 8px;
-            border-radius: 4px;
-            font-size: 0.75em;
-            font-weight: bold;
-            color: #374151;
-        }
-        .bed-plants {
-            position: relative;
-            width: 100%;
-            height: 100%;
-        }
-        .bed-plants svg {
-            position: absolute;
-            top: 0;
-            left: 0;
-            width: 100%;
-            height: 100%;
-        }
-        .bed-plant-label {
-            position: absolute;
-            background: white;
-            padding: 4px 8px;
-            border-radius: 4px;
-            font-size: 0.75em;
-            font-weight: 600;
-            color: #16a34a;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.2);
-            pointer-events: none;
-            white-space: nowrap;
-        }
-        .bed-empty-text {
-            position: absolute;
-            top: 50%;
-            left: 50%;
-            transform: translate(-50%, -50%);
-            color: rgba(255,255,255,0.7);
-            font-size: 0.9em;
-            font-weight: 500;
-        }
-        .bed-selector {
-            display: grid;
-            grid-template-columns: repeat(3, 1fr);
-            gap: 10px;
-            margin-bottom: 15px;
-        }
-        .bed-option {
-            padding: 15px;
-            border: 2px solid #d1d5db;
-            border-radius: 8px;
-            cursor: pointer;
-            text-align: center;
-            transition: all 0.2s;
-            background: white;
-        }
-        .bed-option:hover {
-            border-color: #16a34a;
-            background: #f0fdf4;
-        }
-        .bed-option.selected {
-            border-color: #16a34a;
-            background: #dcfce7;
-            font-weight: bold;
-        }
-        .bed-option-label {
-            font-size: 0.8em;
-            color: #6b7280;
-        }
-        .planting-map-container {
-            margin: 15px 0;
-        }
-        .planting-map {
-            width: 100%;
-            max-width: 400px;
-            aspect-ratio: 2/1;
-            border: 3px solid #16a34a;
-            border-radius: 8px;
-            position: relative;
-            background: linear-gradient(to right, #f0fdf4 0%, #dcfce7 100%);
-            cursor: crosshair;
-            margin: 10px auto;
-            touch-action: none;
-        }
-        .planting-map svg {
-            width: 100%;
-            height: 100%;
-            border-radius: 5px;
-        }
-        .planted-area {
-            fill: #16a34a;
-            fill-opacity: 0.4;
-            stroke: #15803d;
-            stroke-width: 2;
-        }
-        .planting-instructions {
-            text-align: center;
-            font-size: 0.9em;
-            color: #6b7280;
-            margin-top: 8px;
-        }
-        .tabs {
-            display: flex;
-            gap: 10px;
-            margin-bottom: 30px;
-            background: rgba(255, 255, 255, 0.95);
-            padding: 10px;
-            border-radius: 16px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-        }
-        .tab {
-            flex: 1;
-            padding: 15px 25px;
-            background: transparent;
-            border: 2px solid transparent;
-            border-radius: 10px;
-            cursor: pointer;
-            font-size: 16px;
-            font-weight: 600;
-            color: #6b7280;
-            transition: all 0.3s;
-            text-align: center;
-        }
-        .tab:hover {
-            background: rgba(22, 163, 74, 0.1);
-            color: #16a34a;
-        }
-        .tab.active {
-            background: linear-gradient(135deg, #16a34a 0%, #22c55e 100%);
-            color: white;
-            border-color: #15803d;
-        }
-        .tab-content {
-            display: none;
-        }
-        .tab-content.active {
-            display: block;
-        }
-        .schedule-item {
-            background: rgba(255, 255, 255, 0.98);
-            border-radius: 12px;
-            padding: 20px;
-            margin-bottom: 15px;
-            border-left: 4px solid #16a34a;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }
-        .schedule-item.overdue {
-            border-left-color: #ef4444;
-            background: rgba(254, 242, 242, 0.98);
-        }
-        .schedule-item.today {
-            border-left-color: #f59e0b;
-            background: rgba(254, 252, 232, 0.98);
-        }
-        .schedule-item.upcoming {
-            border-left-color: #3b82f6;
-        }
-        .schedule-info {
-            flex: 1;
-        }
-        .schedule-plant-name {
-            font-size: 1.2em;
-            font-weight: bold;
-            color: #16a34a;
-            margin-bottom: 5px;
-        }
-        .schedule-details {
-            color: #6b7280;
-            font-size: 0.9em;
-        }
-        .schedule-status {
-            padding: 8px 16px;
-            border-radius: 20px;
-            font-weight: 600;
-            font-size: 0.85em;
-            margin-right: 15px;
-        }
-        .schedule-status.overdue {
-            background: #fee2e2;
-            color: #dc2626;
-        }
-        .schedule-status.today {
-            background: #fef3c7;
-            color: #d97706;
-        }
-        .schedule-status.upcoming {
-            background: #dbeafe;
-            color: #2563eb;
-        }
-        .weather-widget {
-            background: linear-gradient(135deg, rgba(59, 130, 246, 0.95) 0%, rgba(96, 165, 250, 0.95) 100%);
-            border-radius: 16px;
-            padding: 20px;
-            color: white;
-            box-shadow: 0 4px 15px rgba(59, 130, 246, 0.3);
-            margin-bottom: 30px;
-            backdrop-filter: blur(10px);
-        }
-        .weather-header {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 15px;
-        }
-        .weather-location {
-            font-size: 1.1em;
-            font-weight: 600;
-            display: flex;
-            align-items: center;
-            gap: 8px;
-        }
-        .weather-main {
-            display: flex;
-            align-items: center;
-            justify-content: space-between;
-        }
-        .weather-temp {
-            font-size: 3em;
-            font-weight: bold;
-            line-height: 1;
-        }
-        .weather-icon {
-            font-size: 4em;
-            line-height: 1;
-        }
-        .weather-description {
-            font-size: 1.2em;
-            text-transform: capitalize;
-            margin-top: 5px;
-        }
-        .weather-details {
-            display: grid;
-            grid-template-columns: repeat(3, 1fr);
-            gap: 15px;
-            margin-top: 15px;
-            padding-top: 15px;
-            border-top: 1px solid rgba(255, 255, 255, 0.3);
-        }
-        .weather-detail-item {
-            text-align: center;
-        }
-        .weather-detail-label {
-            font-size: 0.85em;
-            opacity: 0.9;
-            margin-bottom: 5px;
-        }
-        .weather-detail-value {
-            font-size: 1.1em;
-            font-weight: 600;
-        }
-        .weather-loading {
-            text-align: center;
-            padding: 20px;
-            font-size: 1.1em;
-        }
-        .plant-metadata-scientific-name.hidden,
-        .plant-metadata-sunlight.hidden,
-        .plant-metadata-cycle.hidden,
-        .plant-metadata-hardiness.hidden {
-            display: none !important;
-        }
-    </style>
+    <link rel="stylesheet" href="{{ asset_url('garden.css') }}">
 </head>
-<body>
+<body data-revision="{{ revision }}" data-api-base="{{ api_base }}">
     <div class="container">
         <div class="header">
             <h1>🌱 My Garden</h1>
@@ -531,44 +194,10 @@ HTML_TEMPLATE = '''
         <div id="garden-tab" class="tab-content active">
         <!-- Garden Bed Layout -->
         <div class="garden-grid-section">
-            <h2>🏡 Garden Beds (4ft × 8ft)</h2>
-            <div class="garden-layout">
-                {% for row in range(3) %}
-                    {% for col in range(3) %}
-                        {% set bed_plants = beds.get((row, col), []) %}
-                        <div class="garden-bed {% if bed_plants %}has-plants{% endif %}"
-                             onclick="openModalForBed({{ row }}, {{ col }})">
-                            {% if bed_plants %}
-                                <div class="bed-plants">
-                                    <svg xmlns="http://www.w3.org/2000/svg">
-                                        {% for plant in bed_plants %}
-                                            {% if plant.planting_area_json %}
-                                                <rect 
-                                                    x="{{ plant.planting_area_json.x }}%" 
-                                                    y="{{ plant.planting_area_json.y }}%" 
-                                                    width="{{ plant.planting_area_json.width }}%" 
-                                                    height="{{ plant.planting_area_json.height }}%"
-                                                    class="planted-area"
-                                                />
-                                            {% endif %}
-                                        {% endfor %}
-                                    </svg>
-                                    {% for plant in bed_plants %}
-                                        {% if plant.planting_area_json %}
-                                            <div class="bed-plant-label" 
-                                                 style="left: {{ plant.planting_area_json.x + plant.planting_area_json.width/2 }}%; 
-                                                        top: {{ plant.planting_area_json.y + plant.planting_area_json.height/2 }}%; 
-                                                        transform: translate(-50%, -50%);">
-                                                {{ plant.icon }} {{ plant.name }}
-                                            </div>
-                                        {% endif %}
-                                    {% endfor %}
-                                </div>
-                            {% else %}
-                                <div class="bed-empty-text">Click to add plants</div>
-                            {% endif %}
-                        </div>
-                    {% endfor %}
+            <h2>🏡 Garden Beds</h2>
+            <div class="garden-layout" style="grid-template-columns: repeat({{ layout_columns }}, 1fr);">
+                {% for bed in bed_fragments %}
+                    {{ bed }}
                 {% endfor %}
             </div>
         </div>
@@ -576,55 +205,12 @@ HTML_TEMPLATE = '''
         <div class="garden-grid-section">
             <h2>📋 All Plants</h2>
             <div id="plants-container" class="plants-grid">
-            {% if plants %}
-                {% for plant in plants %}
-                <div class="plant-card">
-                    <div class="plant-header">
-                        <div>
-                            <div class="plant-name">{{ plant.name }}</div>
-                            {% if plant.type %}
-                            <div class="plant-type">{{ plant.type }}</div>
-                            {% endif %}
-                        </div>
-                        <div style="display: flex; gap: 8px;">
-                            <button class="btn btn-edit" onclick="editPlant({{ plant.id }})">✏️</button>
-                            <button class="btn btn-delete" onclick="deletePlant({{ plant.id }})">🗑️</button>
-                        </div>
-                    </div>
-                    
-                    <div class="plant-details">
-                        {% if plant.location %}
-                        <div class="plant-detail">📍 {{ plant.location }}</div>
-                        {% endif %}
-                        {% if plant.scientific_name %}
-                        <div class="plant-detail plant-metadata-scientific-name" style="font-style: italic; color: #6b7280;">🔬 {{ plant.scientific_name }}</div>
-                        {% endif %}
-                        {% if plant.planted_date %}
-                        <div class="plant-detail">📅 Planted: {{ plant.planted_date }}</div>
-                        {% endif %}
-                        <div class="plant-detail">💧 Last watered: {{ plant.days_ago }}</div>
-                        {% if plant.watering_frequency %}
-                        <div class="plant-detail">🔄 Watering frequency: {{ plant.watering_frequency }}</div>
-                        {% endif %}
-                        {% if plant.sunlight %}
-                        <div class="plant-detail plant-metadata-sunlight">☀️ Sunlight: {{ plant.sunlight }}</div>
-                        {% endif %}
-                        {% if plant.cycle %}
-                        <div class="plant-detail plant-metadata-cycle">🔄 Cycle: {{ plant.cycle }}</div>
-                        {% endif %}
-                        {% if plant.hardiness_zones %}
-                        <div class="plant-detail plant-metadata-hardiness">🌡️ Zone: {{ plant.hardiness_zones }}</div>
-                        {% endif %}
-                    </div>
-
-                    <button class="btn btn-water" onclick="waterPlant({{ plant.id }})">💧 Water Now</button>
-                </div>
+                {% for card in plant_cards %}
+                {{ card }}
                 {% endfor %}
-            {% else %}
-                <div class="empty-state">
+                <div id="plants-empty" class="empty-state {% if plant_cards %}hidden{% endif %}">
                     <p>No plants added yet. Click on a garden bed above or use the Add Plant button!</p>
                 </div>
-            {% endif %}
         </div>
         </div>
         </div>
@@ -633,27 +219,14 @@ HTML_TEMPLATE = '''
         <div id="schedule-tab" class="tab-content">
             <div class="garden-grid-section">
                 <h2>💧 Watering Schedule</h2>
-                {% if schedule %}
+                <div id="schedule-list">
                     {% for item in schedule %}
-                    <div class="schedule-item {{ item.status }}">
-                        <div class="schedule-info">
-                            <div class="schedule-plant-name">{{ item.icon }} {{ item.name }}</div>
-                            <div class="schedule-details">
-                                📍 {{ item.location }} | 💧 Last watered: {{ item.days_ago }}
-                                {% if item.watering_frequency %}
-                                | 🔄 {{ item.watering_frequency }}
-                                {% endif %}
-                            </div>
-                        </div>
-                        <span class="schedule-status {{ item.status }}">{{ item.status_text }}</span>
-                        <button class="btn btn-water" onclick="waterPlant({{ item.id }})">💧 Water Now</button>
-                    </div>
+                    {{ item }}
                     {% endfor %}
-                {% else %}
-                    <div class="empty-state">
-                        <p>No plants with watering schedules yet. Add plants and set watering frequencies!</p>
-                    </div>
-                {% endif %}
+                </div>
+                <div id="schedule-empty" class="empty-state {% if schedule %}hidden{% endif %}">
+                    <p>No plants with watering schedules yet. Add plants and set watering frequencies!</p>
+                </div>
             </div>
         </div>
     </div>
@@ -668,8 +241,7 @@ HTML_TEMPLATE = '''
                     <div class="bed-selector" id="bedSelector">
                         <!-- Will be populated by JavaScript -->
                     </div>
-                    <input type="hidden" name="bed_row" id="bedRow" required>
-                    <input type="hidden" name="bed_col" id="bedCol" required>
+                    <input type="hidden" name="bed_id" id="bedId" required>
                 </div>
                 <div class="form-group">
                     <label>Plant *</label>
@@ -767,518 +339,333 @@ HTML_TEMPLATE = '''
         </div>
     </div>
 
-    <script>
-        let selectedBedRow = null;
-        let selectedBedCol = null;
-        let isDrawing = false;
-        let startX, startY;
-
-        // Planting map drawing functionality
-        function setupPlantingMap() {
-            const map = document.getElementById('plantingMap');
-            const svg = document.getElementById('plantingSvg');
-            const rect = document.getElementById('plantedRect');
-            
-            function getRelativeCoords(e) {
-                const bounds = svg.getBoundingClientRect();
-                const x = ((e.clientX || e.touches[0].clientX) - bounds.left) / bounds.width * 100;
-                const y = ((e.clientY || e.touches[0].clientY) - bounds.top) / bounds.height * 100;
-                return { x: Math.max(0, Math.min(100, x)), y: Math.max(0, Math.min(100, y)) };
-            }
-            
-            function startDrawing(e) {
-                isDrawing = true;
-                const coords = getRelativeCoords(e);
-                startX = coords.x;
-                startY = coords.y;
-                rect.setAttribute('x', startX + '%');
-                rect.setAttribute('y', startY + '%');
-                rect.setAttribute('width', '0%');
-                rect.setAttribute('height', '0%');
-                rect.style.display = 'block';
-                e.preventDefault();
-            }
-            
-            function draw(e) {
-                if (!isDrawing) return;
-                const coords = getRelativeCoords(e);
-                const width = Math.abs(coords.x - startX);
-                const height = Math.abs(coords.y - startY);
-                const x = Math.min(startX, coords.x);
-                const y = Math.min(startY, coords.y);
-                
-                rect.setAttribute('x', x + '%');
-                rect.setAttribute('y', y + '%');
-                rect.setAttribute('width', width + '%');
-                rect.setAttribute('height', height + '%');
-                e.preventDefault();
-            }
-            
-            function stopDrawing(e) {
-                if (isDrawing) {
-                    isDrawing = false;
-                    // Save the planting area coordinates
-                    const x = parseFloat(rect.getAttribute('x'));
-                    const y = parseFloat(rect.getAttribute('y'));
-                    const width = parseFloat(rect.getAttribute('width'));
-                    const height = parseFloat(rect.getAttribute('height'));
-                    
-                    if (width > 0 && height > 0) {
-                        document.getElementById('plantingArea').value = JSON.stringify({
-                            x: x, y: y, width: width, height: height
-                        });
-                    }
-                }
-            }
-            
-            // Mouse events
-            svg.addEventListener('mousedown', startDrawing);
-            svg.addEventListener('mousemove', draw);
-            svg.addEventListener('mouseup', stopDrawing);
-            svg.addEventListener('mouseleave', stopDrawing);
-            
-            // Touch events for mobile
-            svg.addEventListener('touchstart', startDrawing);
-            svg.addEventListener('touchmove', draw);
-            svg.addEventListener('touchend', stopDrawing);
-        }
-
-        function createBedSelector() {
-            const selector = document.getElementById('bedSelector');
-            selector.innerHTML = '';
-            
-            for (let row = 0; row < 3; row++) {
-                for (let col = 0; col < 3; col++) {
-                    const bedNum = row * 3 + col + 1;
-                    const option = document.createElement('div');
-                    option.className = 'bed-option';
-                    option.innerHTML = `<strong>Bed ${bedNum}</strong>`;
-                    option.onclick = () => selectBed(row, col, option);
-                    selector.appendChild(option);
-                }
-            }
-        }
-
-        function selectBed(row, col, element) {
-            document.querySelectorAll('.bed-option').forEach(el => el.classList.remove('selected'));
-            element.classList.add('selected');
-            selectedBedRow = row;
-            selectedBedCol = col;
-            document.getElementById('bedRow').value = row;
-            document.getElementById('bedCol').value = col;
-        }
-
-        function openModal() {
-            createBedSelector();
-            selectedBedRow = null;
-            selectedBedCol = null;
-            document.getElementById('plantedRect').style.display = 'none';
-            document.getElementById('plantingArea').value = '';
-            document.getElementById('addPlantModal').style.display = 'block';
-            document.querySelector('.modal h2').textContent = 'Add New Plant';
-
-            // Reset form submission to add mode
-            const form = document.getElementById('addPlantForm');
-            form.onsubmit = async (e) => {
-                e.preventDefault();
-                const formData = new FormData(e.target);
-                const data = Object.fromEntries(formData);
-
-                const response = await fetch('/api/plants', {
-                    method: 'POST',
-                    headers: {'Content-Type': 'application/json'},
-                    body: JSON.stringify(data)
-                });
-
-                if (response.ok) {
-                    window.location.reload();
-                }
-            };
-
-            setTimeout(setupPlantingMap, 100);
-        }
-
-        function openModalForBed(row, col) {
-            openModal();
-            const options = document.querySelectorAll('.bed-option');
-            const bedIndex = row * 3 + col;
-            if (options[bedIndex]) {
-                selectBed(row, col, options[bedIndex]);
-            }
-        }
-
-        function closeModal() {
-            document.getElementById('addPlantModal').style.display = 'none';
-            document.getElementById('addPlantForm').reset();
-        }
-
-        async function waterPlant(id) {
-            const response = await fetch(`/api/plants/${id}/water`, {
-                method: 'POST'
-            });
-            if (response.ok) {
-                window.location.reload();
-            }
-        }
-
-        async function editPlant(id) {
-            // Fetch the plant data
-            const response = await fetch(`/api/plants/${id}`);
-            const plant = await response.json();
-
-            // Populate the form with existing data
-            openModal();
-            document.querySelector('input[name="name"]').value = plant.name || '';
-            document.querySelector('input[name="type"]').value = plant.type || '';
-            document.querySelector('input[name="planted_date"]').value = plant.planted_date || '';
-            document.querySelector('input[name="watering_frequency"]').value = plant.watering_frequency || '';
-
-            // Select the correct bed
-            if (plant.bed_row !== null && plant.bed_col !== null) {
-                const options = document.querySelectorAll('.bed-option');
-                const bedIndex = plant.bed_row * 3 + plant.bed_col;
-                if (options[bedIndex]) {
-                    selectBed(plant.bed_row, plant.bed_col, options[bedIndex]);
-                }
-            }
-
-            // Draw existing planting area if it exists
-            if (plant.planting_area) {
-                try {
-                    const area = JSON.parse(plant.planting_area);
-                    const rect = document.getElementById('plantedRect');
-                    rect.setAttribute('x', area.x + '%');
-                    rect.setAttribute('y', area.y + '%');
-                    rect.setAttribute('width', area.width + '%');
-                    rect.setAttribute('height', area.height + '%');
-                    rect.style.display = 'block';
-                    document.getElementById('plantingArea').value = plant.planting_area;
-                } catch (e) {}
-            }
+    <script src="{{ asset_url('garden.js') }}"></script>
+</body>
+</html>
+'''
 
-            // Change the modal title and form behavior for editing
-            document.querySelector('.modal h2').textContent = 'Edit Plant';
-            const form = document.getElementById('addPlantForm');
-            form.onsubmit = async (e) => {
-                e.preventDefault();
-                const formData = new FormData(e.target);
-                const data = Object.fromEntries(formData);
-
-                const response = await fetch(`/api/plants/${id}`, {
-                    method: 'PUT',
-                    headers: {'Content-Type': 'application/json'},
-                    body: JSON.stringify(data)
-                });
-
-                if (response.ok) {
-                    window.location.reload();
-                }
-            };
-        }
-
-        async function deletePlant(id) {
-            if (confirm('Are you sure you want to delete this plant?')) {
-                const response = await fetch(`/api/plants/${id}`, {
-                    method: 'DELETE'
-                });
-                if (response.ok) {
-                    window.location.reload();
-                }
-            }
-        }
-
-        // Tab switching
-        function switchTab(tabName) {
-            // Hide all tab contents
-            document.querySelectorAll('.tab-content').forEach(content => {
-                content.classList.remove('active');
-            });
-
-            // Remove active class from all tabs
-            document.querySelectorAll('.tab').forEach(tab => {
-                tab.classList.remove('active');
-            });
-
-            // Show selected tab content
-            if (tabName === 'garden') {
-                document.getElementById('garden-tab').classList.add('active');
-                document.querySelectorAll('.tab')[0].classList.add('active');
-            } else if (tabName === 'schedule') {
-                document.getElementById('schedule-tab').classList.add('active');
-                document.querySelectorAll('.tab')[1].classList.add('active');
-            }
-        }
-
-        // Weather functionality
-        async function fetchWeather() {
-            try {
-                // Using Open-Meteo free weather API (no API key needed)
-                // Coordinates for Swansboro, NC
-                const lat = 34.6876;
-                const lon = -77.1192;
-
-                const response = await fetch(
-                    `https://api.open-meteo.com/v1/forecast?latitude=${lat}&longitude=${lon}&current=temperature_2m,relative_humidity_2m,apparent_temperature,precipitation,weather_code,wind_speed_10m&temperature_unit=fahrenheit&wind_speed_unit=mph&precipitation_unit=inch&timezone=America%2FNew_York`
-                );
-
-                const data = await response.json();
-                const current = data.current;
-
-                // Weather code to emoji and description mapping
-                const weatherCodeMap = {
-                    0: { emoji: '☀️', desc: 'Clear sky' },
-                    1: { emoji: '🌤️', desc: 'Mainly clear' },
-                    2: { emoji: '⛅', desc: 'Partly cloudy' },
-                    3: { emoji: '☁️', desc: 'Overcast' },
-                    45: { emoji: '🌫️', desc: 'Foggy' },
-                    48: { emoji: '🌫️', desc: 'Foggy' },
-                    51: { emoji: '🌦️', desc: 'Light drizzle' },
-                    53: { emoji: '🌦️', desc: 'Moderate drizzle' },
-                    55: { emoji: '🌧️', desc: 'Heavy drizzle' },
-                    61: { emoji: '🌧️', desc: 'Light rain' },
-                    63: { emoji: '🌧️', desc: 'Moderate rain' },
-                    65: { emoji: '🌧️', desc: 'Heavy rain' },
-                    71: { emoji: '🌨️', desc: 'Light snow' },
-                    73: { emoji: '🌨️', desc: 'Moderate snow' },
-                    75: { emoji: '🌨️', desc: 'Heavy snow' },
-                    77: { emoji: '🌨️', desc: 'Snow grains' },
-                    80: { emoji: '🌦️', desc: 'Light showers' },
-                    81: { emoji: '🌧️', desc: 'Moderate showers' },
-                    82: { emoji: '🌧️', desc: 'Heavy showers' },
-                    85: { emoji: '🌨️', desc: 'Light snow showers' },
-                    86: { emoji: '🌨️', desc: 'Heavy snow showers' },
-                    95: { emoji: '⛈️', desc: 'Thunderstorm' },
-                    96: { emoji: '⛈️', desc: 'Thunderstorm with hail' },
-                    99: { emoji: '⛈️', desc: 'Thunderstorm with hail' }
-                };
-
-                const weather = weatherCodeMap[current.weather_code] || { emoji: '🌤️', desc: 'Unknown' };
-
-                document.getElementById('weatherWidget').innerHTML = `
-                    <div class="weather-header">
-                        <div class="weather-location">
-                            📍 Swansboro, NC
-                        </div>
-                        <div style="font-size: 0.9em; opacity: 0.9;">
-                            ${new Date().toLocaleDateString('en-US', { weekday: 'short', month: 'short', day: 'numeric' })}
-                        </div>
-                    </div>
-                    <div class="weather-main">
-                        <div>
-                            <div class="weather-temp">${Math.round(current.temperature_2m)}°F</div>
-                            <div class="weather-description">${weather.desc}</div>
-                            <div style="font-size: 0.9em; opacity: 0.9; margin-top: 5px;">
-                                Feels like ${Math.round(current.apparent_temperature)}°F
-                            </div>
-                        </div>
-                        <div class="weather-icon">${weather.emoji}</div>
-                    </div>
-                    <div class="weather-details">
-                        <div class="weather-detail-item">
-                            <div class="weather-detail-label">💧 Humidity</div>
-                            <div class="weather-detail-value">${current.relative_humidity_2m}%</div>
-                        </div>
-                        <div class="weather-detail-item">
-                            <div class="weather-detail-label">💨 Wind</div>
-                            <div class="weather-detail-value">${Math.round(current.wind_speed_10m)} mph</div>
-                        </div>
-                        <div class="weather-detail-item">
-                            <div class="weather-detail-label">🌧️ Rain</div>
-                            <div class="weather-detail-value">${current.precipitation}" /hr</div>
-                        </div>
+# Garden bed fragment, rendered per bed and cached until the bed's version changes
+BED_TEMPLATE = '''
+<div class="garden-bed {% if bed_plants %}has-plants{% endif %}" id="bed-{{ bed.id }}"
+     data-bed-id="{{ bed.id }}" data-bed-name="{{ bed.name }}"
+     style="grid-row: {{ bed.grid_row + 1 }}; grid-column: {{ bed.grid_col + 1 }}; aspect-ratio: {{ bed.length_ft }} / {{ bed.width_ft }};"
+     onclick="openModalForBed({{ bed.id }})">
+    <div class="bed-label">{{ bed.name }}</div>
+    {% if bed_plants %}
+        <div class="bed-plants">
+            <svg xmlns="http://www.w3.org/2000/svg">
+                {% for plant in bed_plants %}
+                    {% if plant.planting_area_json %}
+                        <rect 
+                            x="{{ plant.planting_area_json.x }}%" 
+                            y="{{ plant.planting_area_json.y }}%" 
+                            width="{{ plant.planting_area_json.width }}%" 
+                            height="{{ plant.planting_area_json.height }}%"
+                            class="planted-area"
+                        />
+                    {% endif %}
+                {% endfor %}
+            </svg>
+            {% for plant in bed_plants %}
+                {% if plant.planting_area_json %}
+                    <div class="bed-plant-label" 
+                         style="left: {{ plant.planting_area_json.x + plant.planting_area_json.width/2 }}%; 
+                                top: {{ plant.planting_area_json.y + plant.planting_area_json.height/2 }}%; 
+                                transform: translate(-50%, -50%);">
+                        {{ plant.icon }} {{ plant.name }}
                     </div>
-                `;
-            } catch (error) {
-                console.error('Weather fetch error:', error);
-                document.getElementById('weatherWidget').innerHTML = `
-                    <div class="weather-loading">⚠️ Unable to load weather data</div>
-                `;
-            }
-        }
+                {% endif %}
+            {% endfor %}
+        </div>
+    {% else %}
+        <div class="bed-empty-text">Click to add plants</div>
+    {% endif %}
+</div>
+'''
 
-        // Fetch weather on page load
-        fetchWeather();
+# Plant card fragment, cached per plant until its bed's version or the date changes
+PLANT_CARD_TEMPLATE = '''
+<div class="plant-card" id="plant-card-{{ plant.id }}">
+    <div class="plant-header">
+        <div>
+            <div class="plant-name">{{ plant.name }}</div>
+            {% if plant.type %}
+            <div class="plant-type">{{ plant.type }}</div>
+            {% endif %}
+        </div>
+        <div style="display: flex; gap: 8px;">
+            <button class="btn btn-edit" onclick="editPlant({{ plant.id }})">✏️</button>
+            <button class="btn btn-delete" onclick="deletePlant({{ plant.id }})">🗑️</button>
+        </div>
+    </div>
+    
+    <div class="plant-details">
+        {% if plant.location %}
+        <div class="plant-detail">📍 {{ plant.location }}</div>
+        {% endif %}
+        {% if plant.scientific_name %}
+        <div class="plant-detail plant-metadata-scientific-name" style="font-style: italic; color: #6b7280;">🔬 {{ plant.scientific_name }}</div>
+        {% endif %}
+        {% if plant.planted_date %}
+        <div class="plant-detail">📅 Planted: {{ plant.planted_date }}</div>
+        {% endif %}
+        <div class="plant-detail">💧 Last watered: {{ plant.days_ago }}</div>
+        {% if plant.watering_frequency %}
+        <div class="plant-detail">🔄 Watering frequency: {{ plant.watering_frequency }}</div>
+        {% endif %}
+        {% if plant.sunlight %}
+        <div class="plant-detail plant-metadata-sunlight">☀️ Sunlight: {{ plant.sunlight }}</div>
+        {% endif %}
+        {% if plant.cycle %}
+        <div class="plant-detail plant-metadata-cycle">🔄 Cycle: {{ plant.cycle }}</div>
+        {% endif %}
+        {% if plant.hardiness_zones %}
+        <div class="plant-detail plant-metadata-hardiness">🌡️ Zone: {{ plant.hardiness_zones }}</div>
+        {% endif %}
+    </div>
 
-        // Refresh weather every 10 minutes
-        setInterval(fetchWeather, 600000);
+    <button class="btn btn-water" onclick="waterPlant({{ plant.id }})">💧 Water Now</button>
+</div>
+'''
 
-        // Plant lookup functionality
-        async function openPlantLookup() {
-            const plantName = document.getElementById('plantName').value;
-            const plantVariety = document.getElementById('plantVariety').value;
-            const searchTerm = plantVariety || plantName;
+# Watering schedule entry, ordered on the page by next due day
+SCHEDULE_ITEM_TEMPLATE = '''
+<div class="schedule-item {{ item.status }}" id="schedule-item-{{ item.id }}"
+     data-next-due="{{ item.next_due_day if item.next_due_day is not none else '' }}">
+    <div class="schedule-info">
+        <div class="schedule-plant-name">{{ item.icon }} {{ item.name }}</div>
+        <div class="schedule-details">
+            📍 {{ item.location }} | 💧 Last watered: {{ item.days_ago }}
+            {% if item.watering_frequency %}
+            | 🔄 {{ item.watering_frequency }}
+            {% endif %}
+            {% if item.rain_note %}
+            | 🌧️ {{ item.rain_note }}
+            {% endif %}
+        </div>
+    </div>
+    <span class="schedule-status {{ item.status }}">{{ item.status_text }}</span>
+    <button class="btn btn-water" onclick="waterPlant({{ item.id }})">💧 Water Now</button>
+</div>
+'''
 
-            if (!searchTerm) {
-                alert('Please enter a plant name or variety first');
-                return;
-            }
+# Plant type keyword to emoji, first listed keyword found in the type wins.
+# Edit plant_icons.json (or point PLANT_ICONS_PATH elsewhere) to extend it.
+PLANT_ICONS_PATH = os.environ.get(
+    'PLANT_ICONS_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'plant_icons.json')
+)
+
+def load_plant_icons(path):
+    """The ordered keyword -> emoji table; 'default' covers types no keyword matches"""
+    with open(path, encoding='utf-8') as f:
+        icons = json.load(f)
+    icons.setdefault('default', '🌱')
+    return icons
+
+PLANT_ICONS = load_plant_icons(PLANT_ICONS_PATH)
+PLANT_ICON_KEYWORDS = [key for key in PLANT_ICONS if key != 'default']
+# A lookahead finds every keyword starting at every position in one scan;
+# at each position the earliest-listed keyword is the one reported
+PLANT_ICON_RE = re.compile(
+    '(?=(' + '|'.join(re.escape(key.lower()) for key in PLANT_ICON_KEYWORDS) + '))'
+) if PLANT_ICON_KEYWORDS else None
+PLANT_ICON_PRIORITY = {key.lower(): i for i, key in reversed(list(enumerate(PLANT_ICON_KEYWORDS)))}
+# Stored with the plant rows' icons so a changed table is noticed at startup
+PLANT_ICONS_HASH = int(hashlib.sha256(
+    json.dumps(list(PLANT_ICONS.items()), ensure_ascii=False).encode()
+).hexdigest()[:15], 16)
+
+# Templates are compiled once at import rather than on every request
+INDEX_TEMPLATE = app.jinja_env.from_string(HTML_TEMPLATE)
+BED_FRAGMENT = app.jinja_env.from_string(BED_TEMPLATE)
+PLANT_CARD_FRAGMENT = app.jinja_env.from_string(PLANT_CARD_TEMPLATE)
+SCHEDULE_ITEM_FRAGMENT = app.jinja_env.from_string(SCHEDULE_ITEM_TEMPLATE)
+
+# Part of the index ETag, so a deploy with new markup never matches an old page
+TEMPLATE_VERSION = hashlib.sha256(
+    (HTML_TEMPLATE + BED_TEMPLATE + PLANT_CARD_TEMPLATE + SCHEDULE_ITEM_TEMPLATE).encode()
+    + ''.join(asset.digest for asset in ASSETS.values()).encode()
+    + str(PLANT_ICONS_HASH).encode()
+).hexdigest()[:12]
+
+class LRUCache:
+    """Thread-safe mapping that drops the least recently used entries past maxsize"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return default
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+fragment_cache = LRUCache(app.config['FRAGMENT_CACHE_SIZE'])
+
+class ConnectionPool:
+    """Bounded pool of tuned SQLite connections for one database file"""
+
+    def __init__(self, path, size):
+        self.path = path
+        self.size = size
+        self.closed = False
+        self._idle = queue.LifoQueue(maxsize=size)
+
+    def _connect(self):
+        # Connections are handed between request threads, but only one
+        # request uses a connection at a time.
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f"PRAGMA cache_size=-{app.config['DB_CACHE_SIZE_KB']}")
+        conn.execute(f"PRAGMA mmap_size={app.config['DB_MMAP_SIZE']}")
+        conn.execute(f"PRAGMA busy_timeout={app.config['DB_BUSY_TIMEOUT_MS']}")
+        return conn
+
+    def acquire(self):
+        """Take an idle connection, opening a new one if none are free"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def release(self, conn):
+        """Return a connection to the pool, closing it if the pool is full or closed"""
+        if conn.in_transaction:
+            conn.rollback()
+        if self.closed:
+            conn.close()
+            return
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self):
+        """Close every idle connection; ones still in use are closed when released"""
+        self.closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
 
-            const resultsDiv = document.getElementById('plantSearchResults');
-            resultsDiv.innerHTML = '<div style="padding: 15px; text-align: center;">🔍 Searching...</div>';
-            resultsDiv.style.display = 'block';
-
-            try {
-                const response = await fetch(`/api/plants/search?q=${encodeURIComponent(searchTerm)}`);
-                const data = await response.json();
-
-                if (data.error) {
-                    resultsDiv.innerHTML = `<div style="padding: 15px; color: #ef4444;">${data.error}</div>`;
-                    return;
-                }
-
-                if (!data.results || data.results.length === 0) {
-                    resultsDiv.innerHTML = '<div style="padding: 15px;">No plants found. Try a different search term.</div>';
-                    return;
-                }
-
-                resultsDiv.innerHTML = data.results.map(plant => `
-                    <div class="plant-search-result" onclick='selectPlant(${plant.id}, ${JSON.stringify(plant.common_name)})' style="padding: 12px; border-bottom: 1px solid #e5e7eb; cursor: pointer; display: flex; align-items: center; gap: 12px;">
-                        ${plant.image ? `<img src="${plant.image}" style="width: 50px; height: 50px; border-radius: 8px; object-fit: cover;">` : '<div style="width: 50px; height: 50px; background: #f3f4f6; border-radius: 8px; display: flex; align-items: center; justify-content: center;">🌱</div>'}
-                        <div style="flex: 1;">
-                            <div style="font-weight: 600; color: #16a34a;">${plant.common_name}</div>
-                            ${plant.scientific_name ? `<div style="font-size: 0.85em; color: #6b7280; font-style: italic;">${plant.scientific_name}</div>` : ''}
-                            <div style="font-size: 0.85em; color: #6b7280; margin-top: 4px;">
-                                ${plant.sunlight ? `☀️ ${plant.sunlight}` : ''}
-                                ${plant.watering ? `💧 ${plant.watering}` : ''}
-                            </div>
-                        </div>
-                    </div>
-                `).join('');
-            } catch (error) {
-                resultsDiv.innerHTML = `<div style="padding: 15px; color: #ef4444;">Error: ${error.message}</div>`;
-            }
-        }
-
-        async function selectPlant(perenualId, commonName) {
-            const resultsDiv = document.getElementById('plantSearchResults');
-            resultsDiv.innerHTML = '<div style="padding: 15px; text-align: center;">Loading plant details...</div>';
-
-            try {
-                const response = await fetch(`/api/plants/details/${perenualId}`);
-                const details = await response.json();
-
-                if (details.error) {
-                    alert(details.error);
-                    resultsDiv.style.display = 'none';
-                    return;
-                }
-
-                // Populate the variety field with the common name
-                document.getElementById('plantVariety').value = commonName || '';
-
-                // Populate hidden fields with metadata
-                document.getElementById('scientificName').value = details.scientific_name || '';
-                document.getElementById('sunlight').value = details.sunlight || '';
-                document.getElementById('wateringNeeds').value = details.watering_needs || '';
-                document.getElementById('cycle').value = details.cycle || '';
-                document.getElementById('hardinessZones').value = details.hardiness_zones || '';
-                document.getElementById('description').value = details.description || '';
-                document.getElementById('perenualId').value = details.perenual_id || '';
-
-                // Update form field hints
-                if (details.watering_needs && !document.querySelector('input[name="watering_frequency"]').value) {
-                    document.querySelector('input[name="watering_frequency"]').value = details.watering_needs;
-                }
-
-                resultsDiv.innerHTML = '<div style="padding: 15px; background: #dcfce7; color: #16a34a; border-radius: 8px;">✅ Plant details loaded! Metadata will be saved with your plant.</div>';
-                setTimeout(() => {
-                    resultsDiv.style.display = 'none';
-                }, 3000);
-            } catch (error) {
-                alert(`Error loading plant details: ${error.message}`);
-                resultsDiv.style.display = 'none';
-            }
-        }
-
-        // Settings functionality
-        function loadDisplaySettings() {
-            const settings = JSON.parse(localStorage.getItem('plantDisplaySettings') || '{"showScientificName":true,"showSunlight":true,"showCycle":true,"showHardinessZones":true}');
-
-            document.getElementById('showScientificName').checked = settings.showScientificName;
-            document.getElementById('showSunlight').checked = settings.showSunlight;
-            document.getElementById('showCycle').checked = settings.showCycle;
-            document.getElementById('showHardinessZones').checked = settings.showHardinessZones;
-
-            return settings;
-        }
-
-        function saveDisplaySettings() {
-            const settings = {
-                showScientificName: document.getElementById('showScientificName').checked,
-                showSunlight: document.getElementById('showSunlight').checked,
-                showCycle: document.getElementById('showCycle').checked,
-                showHardinessZones: document.getElementById('showHardinessZones').checked
-            };
-            localStorage.setItem('plantDisplaySettings', JSON.stringify(settings));
-
-            // Reload page to apply new settings
-            window.location.reload();
-        }
-
-        function openSettingsModal() {
-            loadDisplaySettings();
-            document.getElementById('settingsModal').style.display = 'block';
-        }
-
-        function closeSettingsModal() {
-            document.getElementById('settingsModal').style.display = 'none';
-        }
-
-        // Load settings on page load and apply them
-        const displaySettings = loadDisplaySettings();
-
-        // Apply display settings to plant cards
-        function applyDisplaySettings() {
-            const settings = loadDisplaySettings();
-
-            // Toggle scientific name
-            document.querySelectorAll('.plant-metadata-scientific-name').forEach(el => {
-                el.classList.toggle('hidden', !settings.showScientificName);
-            });
-
-            // Toggle sunlight
-            document.querySelectorAll('.plant-metadata-sunlight').forEach(el => {
-                el.classList.toggle('hidden', !settings.showSunlight);
-            });
-
-            // Toggle cycle
-            document.querySelectorAll('.plant-metadata-cycle').forEach(el => {
-                el.classList.toggle('hidden', !settings.showCycle);
-            });
-
-            // Toggle hardiness zones
-            document.querySelectorAll('.plant-metadata-hardiness').forEach(el => {
-                el.classList.toggle('hidden', !settings.showHardinessZones);
-            });
-        }
-
-        // Apply settings on page load
-        applyDisplaySettings();
-
-        // Close modal when clicking outside
-        window.onclick = function(event) {
-            const addModal = document.getElementById('addPlantModal');
-            const settingsModal = document.getElementById('settingsModal');
-            if (event.target == addModal) {
-                closeModal();
-            } else if (event.target == settingsModal) {
-                closeSettingsModal();
-            }
-        }
-    </script>
-</body>
-</html>
-'''
+DEFAULT_GARDEN = 'default'
+GARDEN_ID_RE = re.compile(r'[a-z0-9][a-z0-9_-]{0,63}')
+
+def garden_database(garden_id):
+    """SQLite file holding a garden's plants and beds; the default garden's is DATABASE_PATH"""
+    if garden_id == DEFAULT_GARDEN:
+        return app.config['DATABASE']
+    return os.path.join(app.config['GARDENS_DIR'], f'{garden_id}.db')
+
+def current_database():
+    """Database file of the garden the current request or job is working on"""
+    return garden_database(g.get('garden_id', DEFAULT_GARDEN))
+
+def list_gardens():
+    """The default garden followed by every garden with a shard file, by id"""
+    try:
+        names = os.listdir(app.config['GARDENS_DIR'])
+    except FileNotFoundError:
+        names = []
+    shards = sorted(name[:-3] for name in names if name.endswith('.db') and GARDEN_ID_RE.fullmatch(name[:-3]))
+    return [DEFAULT_GARDEN] + [garden_id for garden_id in shards if garden_id != DEFAULT_GARDEN]
+
+@contextmanager
+def garden_context(garden_id):
+    """App context working on one garden's database, for code running outside a request"""
+    with app.app_context():
+        g.garden_id = garden_id
+        yield
+
+# Pools by database path, least recently used first
+_pools = OrderedDict()
+_pools_lock = threading.Lock()
+
+def get_pool(path):
+    """Get the connection pool for a database file, or None if pooling is off.
+
+    Past GARDEN_POOL_LIMIT garden pools, the least recently used one is
+    closed. The main database's pool is never evicted.
+    """
+    size = app.config['DB_POOL_SIZE']
+    if size <= 0:
+        return None
+    main = app.config['DATABASE']
+    with _pools_lock:
+        pool = _pools.get(path)
+        if pool is None:
+            pool = _pools[path] = ConnectionPool(path, size)
+        _pools.move_to_end(path)
+        while len(_pools) > app.config['GARDEN_POOL_LIMIT'] + (main in _pools):
+            oldest = next(key for key in _pools if key != main)
+            _pools.pop(oldest).close()
+    return pool
+
+def open_db(path):
+    """(connection, pool) for a database file; the pool is None when pooling is off"""
+    pool = get_pool(path)
+    if pool is None:
+        conn = sqlite3.connect(path)
+        conn.row_factory = sqlite3.Row
+        return conn, None
+    return pool.acquire(), pool
 
 def get_db():
-    """Get database connection"""
-    conn = sqlite3.connect(app.config['DATABASE'])
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get the current garden's database connection for the current app context"""
+    if 'db' not in g:
+        g.db, g.db_pool = open_db(current_database())
+    return g.db
+
+def get_shared_db():
+    """Connection to the main database, home of the species caches, catalog and API budget"""
+    if current_database() == app.config['DATABASE']:
+        return get_db()
+    if 'shared_db' not in g:
+        g.shared_db, g.shared_db_pool = open_db(app.config['DATABASE'])
+    return g.shared_db
+
+@app.teardown_appcontext
+def release_db(exc):
+    """Hand the context's connections back to the pools they came from"""
+    for name in ('db', 'shared_db'):
+        conn = g.pop(name, None)
+        pool = g.pop(f'{name}_pool', None)
+        if conn is None:
+            continue
+        if pool is None:
+            conn.close()
+        else:
+            pool.release(conn)
 
 def init_db():
-    """Initialize database"""
+    """Initialize database; a new one gets the current schema, older ones are left to migrate_db.py"""
     conn = get_db()
+    fresh = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'plants'").fetchone() is None
     conn.execute('''
         CREATE TABLE IF NOT EXISTS plants (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -1287,33 +674,527 @@ def init_db():
             planted_date TEXT,
             location TEXT,
             watering_frequency TEXT,
-            last_watered TEXT
+            last_watered TEXT,
+            bed_row INTEGER,
+            bed_col INTEGER,
+            planting_area TEXT,
+            scientific_name TEXT,
+            sunlight TEXT,
+            watering_needs TEXT,
+            cycle TEXT,
+            hardiness_zones TEXT,
+            description TEXT,
+            perenual_id INTEGER,
+            watering_interval_days INTEGER,
+            last_watered_day INTEGER,
+            next_due_day INTEGER,
+            icon TEXT,
+            area_x REAL,
+            area_y REAL,
+            area_width REAL,
+            area_height REAL,
+            bed_id INTEGER REFERENCES beds(id)
         )
     ''')
+    if fresh:
+        create_beds(conn)
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_plants_next_due ON plants(next_due_day)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_plants_bed_id ON plants(bed_id)')
+        create_plant_areas(conn)
+        # Nothing for migrate_db.py to do on a database that starts out current
+        migrate_db.set_schema_version(conn, migrate_db.CURRENT_VERSION)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS app_meta (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS perenual_search_cache (
+            query_key TEXT PRIMARY KEY,
+            results TEXT NOT NULL,
+            fetched_at REAL NOT NULL,
+            last_used REAL NOT NULL
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_perenual_search_cache_last_used ON perenual_search_cache(last_used)')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS perenual_details_cache (
+            perenual_id INTEGER PRIMARY KEY,
+            details TEXT NOT NULL,
+            fetched_at REAL NOT NULL
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS enrichment_jobs (
+            plant_id INTEGER PRIMARY KEY,
+            perenual_id INTEGER NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt_at REAL NOT NULL,
+            last_error TEXT
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_enrichment_jobs_due ON enrichment_jobs(status, next_attempt_at)')
+    create_species_catalog(conn)
     conn.commit()
-    conn.close()
 
-def get_days_ago(date_str):
-    """Calculate days since a date"""
+def create_beds(conn):
+    """Create the beds table and seed it with the original 3x3 grid of 4ft x 8ft beds"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS beds (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            grid_row INTEGER NOT NULL,
+            grid_col INTEGER NOT NULL,
+            width_ft REAL NOT NULL DEFAULT 4,
+            length_ft REAL NOT NULL DEFAULT 8,
+            UNIQUE (grid_row, grid_col)
+        )
+    ''')
+    conn.executemany(
+        'INSERT OR IGNORE INTO beds (id, name, grid_row, grid_col) VALUES (?, ?, ?, ?)',
+        [(row * 3 + col + 1, f'Bed {row * 3 + col + 1}', row, col) for row in range(3) for col in range(3)]
+    )
+
+def create_species_catalog(conn):
+    """Create the offline species catalog and its full-text index"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS species_catalog (
+            perenual_id INTEGER PRIMARY KEY,
+            common_name TEXT,
+            scientific_name TEXT,
+            other_names TEXT,
+            record TEXT NOT NULL
+        )
+    ''')
+    conn.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS species_catalog_fts USING fts5(
+            common_name, scientific_name, other_names,
+            content='species_catalog', content_rowid='perenual_id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+    ''')
+
+def create_plant_areas(conn):
+    """Create the planting area R*Tree, the triggers mirroring plants into it, and fill it"""
+    # One box per placed plant. The bed is a dimension too, so a lookup only
+    # ever touches boxes in the one bed
+    conn.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS plant_areas USING rtree(
+            id, min_bed, max_bed, min_x, max_x, min_y, max_y
+        )
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS plant_areas_insert AFTER INSERT ON plants
+        WHEN NEW.area_x IS NOT NULL AND NEW.bed_id IS NOT NULL
+        BEGIN
+            INSERT INTO plant_areas VALUES (
+                NEW.id, NEW.bed_id, NEW.bed_id,
+                NEW.area_x, NEW.area_x + NEW.area_width, NEW.area_y, NEW.area_y + NEW.area_height
+            );
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS plant_areas_update
+        AFTER UPDATE OF bed_id, area_x, area_y, area_width, area_height ON plants
+        BEGIN
+            DELETE FROM plant_areas WHERE id = OLD.id;
+            INSERT INTO plant_areas
+            SELECT NEW.id, NEW.bed_id, NEW.bed_id,
+                   NEW.area_x, NEW.area_x + NEW.area_width, NEW.area_y, NEW.area_y + NEW.area_height
+            WHERE NEW.area_x IS NOT NULL AND NEW.bed_id IS NOT NULL;
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS plant_areas_delete AFTER DELETE ON plants
+        BEGIN
+            DELETE FROM plant_areas WHERE id = OLD.id;
+        END
+    ''')
+    conn.execute('DELETE FROM plant_areas')
+    conn.execute('''
+        INSERT INTO plant_areas
+        SELECT id, bed_id, bed_id, area_x, area_x + area_width, area_y, area_y + area_height
+        FROM plants
+        WHERE area_x IS NOT NULL AND bed_id IS NOT NULL
+    ''')
+
+def bed_version_key(bed_id):
+    """app_meta key holding the version of a bed's rendered fragments"""
+    if bed_id is None:
+        return 'bed_version:none'
+    return f'bed_version:{bed_id}'
+
+def record_plant_write(conn, *bed_ids):
+    """Bump the garden revision and the version of every bed a plant write touched"""
+    for key in {bed_version_key(bed_id) for bed_id in bed_ids}:
+        conn.execute('''
+            INSERT INTO app_meta (key, value) VALUES (?, 1)
+            ON CONFLICT(key) DO UPDATE SET value = value + 1
+        ''', (key,))
+    return conn.execute('''
+        INSERT INTO app_meta (key, value) VALUES ('revision', 1)
+        ON CONFLICT(key) DO UPDATE SET value = value + 1
+        RETURNING value
+    ''').fetchone()[0]
+
+def get_revision(conn):
+    """Counter bumped by every plant write, used to build ETags"""
+    row = conn.execute("SELECT value FROM app_meta WHERE key = 'revision'").fetchone()
+    return row['value'] if row else 0
+
+def not_modified(etag):
+    """A 304 response if the client already holds etag, otherwise None"""
+    if request.if_none_match.contains_weak(etag):
+        return app.response_class(status=304)
+    return None
+
+def add_validators(response, etag):
+    """Attach the ETag and tell clients to revalidate before reusing their copy"""
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def get_bed_versions(conn):
+    """Current version of every bed that has been written to"""
+    rows = conn.execute("SELECT key, value FROM app_meta WHERE key LIKE 'bed_version:%'")
+    return {row['key']: row['value'] for row in rows}
+
+def get_plant_bed(conn, plant_id):
+    """A plant's row with just its bed_id, or None if there's no such plant"""
+    return conn.execute('SELECT bed_id FROM plants WHERE id = ?', (plant_id,)).fetchone()
+
+def get_beds(conn):
+    """Every bed in layout order"""
+    return conn.execute('SELECT * FROM beds ORDER BY grid_row, grid_col').fetchall()
+
+def find_bed(conn, data):
+    """The bed a plant write names, by bed_id or by bed_row/bed_col grid position.
+
+    Returns None when no bed is given; raises LookupError for a bed that doesn't exist.
+    """
+    bed_id = data.get('bed_id')
+    if bed_id not in (None, ''):
+        bed = conn.execute('SELECT * FROM beds WHERE id = ?', (int(bed_id),)).fetchone()
+    elif data.get('bed_row') not in (None, '') and data.get('bed_col') not in (None, ''):
+        # Clients from before beds had ids send the grid position instead
+        bed = conn.execute(
+            'SELECT * FROM beds WHERE grid_row = ? AND grid_col = ?',
+            (int(data['bed_row']), int(data['bed_col']))
+        ).fetchone()
+    else:
+        return None
+    if bed is None:
+        raise LookupError('Unknown bed')
+    return bed
+
+def bed_placement(bed):
+    """(bed_id, location, bed_row, bed_col) stored on a plant placed in bed, which may be None"""
+    if bed is None:
+        return None, None, None, None
+    return bed['id'], bed['name'], bed['grid_row'], bed['grid_col']
+
+plant_icon_cache = LRUCache(4096)
+
+def get_plant_icon(plant_type):
+    """Pick an emoji for a plant type"""
+    icon = plant_icon_cache.get(plant_type)
+    if icon is None:
+        icon = PLANT_ICONS['default']
+        if PLANT_ICON_RE is not None:
+            found = {match.group(1) for match in PLANT_ICON_RE.finditer((plant_type or '').lower())}
+            if found:
+                icon = PLANT_ICONS[PLANT_ICON_KEYWORDS[min(PLANT_ICON_PRIORITY[key] for key in found)]]
+        plant_icon_cache.set(plant_type, icon)
+    return icon
+
+def plant_icon(plant):
+    """A plant row's stored icon, resolved from its type for rows stored without one"""
     try:
-        last_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-        days = (date.today() - last_date).days
-        if days == 0:
-            return "Today"
-        elif days == 1:
-            return "Yesterday"
-        else:
-            return f"{days} days ago"
-    except:
-        return "Unknown"
+        icon = plant['icon']
+    except (IndexError, KeyError):
+        icon = None
+    return icon or get_plant_icon(plant['type'])
+
+def sync_plant_icons(conn):
+    """Re-resolve stored icons if the icon table changed since they were written; returns types updated"""
+    columns = [row[1] for row in conn.execute('PRAGMA table_info(plants)')]
+    if 'icon' not in columns:
+        return 0  # not migrated yet (migrate_db.py v6)
+    row = conn.execute("SELECT value FROM app_meta WHERE key = 'plant_icons_hash'").fetchone()
+    if row is not None and row[0] == PLANT_ICONS_HASH:
+        return 0
+    types = resolve_plant_icons(conn)
+    conn.commit()
+    return types
 
-def get_days_since(date_str):
-    """Get numeric days since a date"""
+def resolve_plant_icons(conn):
+    """Store every plant's icon from the current table and record its hash, without committing"""
+    types = [row[0] for row in conn.execute('SELECT DISTINCT type FROM plants')]
+    conn.executemany('UPDATE plants SET icon = ? WHERE type IS ?', [(get_plant_icon(t), t) for t in types])
+    conn.execute('''
+        INSERT INTO app_meta (key, value) VALUES ('plant_icons_hash', ?)
+        ON CONFLICT(key) DO UPDATE SET value = excluded.value
+    ''', (PLANT_ICONS_HASH,))
+    return len(types)
+
+def parse_planting_area(planting_area):
+    """Decode a planting_area JSON string, or None if it's missing or malformed"""
+    if not planting_area:
+        return None
     try:
-        last_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-        return (date.today() - last_date).days
-    except:
-        return 999
+        return json.loads(planting_area)
+    except ValueError:
+        return None
+
+def area_columns(planting_area):
+    """(x, y, width, height) from a planting_area JSON string or object, or four Nones"""
+    area = planting_area if isinstance(planting_area, dict) else parse_planting_area(planting_area)
+    try:
+        columns = tuple(float(area[key]) for key in ('x', 'y', 'width', 'height'))
+    except (TypeError, KeyError, ValueError):
+        return None, None, None, None
+    if columns[2] <= 0 or columns[3] <= 0:
+        return None, None, None, None
+    return columns
+
+def stored_planting_area(planting_area):
+    """planting_area as stored: JSON text, whether it was sent as text or an object"""
+    return json.dumps(planting_area) if isinstance(planting_area, dict) else planting_area
+
+def plant_area(plant):
+    """A plant row's planting area as an {x, y, width, height} dict, or None"""
+    if plant['area_x'] is None:
+        return None
+    return {'x': plant['area_x'], 'y': plant['area_y'],
+            'width': plant['area_width'], 'height': plant['area_height']}
+
+def find_overlaps(conn, bed_id, area, exclude_id=None):
+    """Plants in the bed whose planting areas overlap area; shared edges don't count"""
+    x, y, width, height = area
+    if x is None or bed_id is None:
+        return []
+    # The R*Tree stores 32-bit floats rounded outward, so it only narrows the
+    # candidates; the exact test runs against the REAL columns
+    return conn.execute('''
+        SELECT p.id, p.name FROM plant_areas a JOIN plants p ON p.id = a.id
+        WHERE a.min_bed <= :bed AND a.max_bed >= :bed
+          AND a.min_x < :x2 AND a.max_x > :x AND a.min_y < :y2 AND a.max_y > :y
+          AND p.area_x < :x2 AND p.area_x + p.area_width > :x
+          AND p.area_y < :y2 AND p.area_y + p.area_height > :y
+          AND p.id IS NOT :exclude
+        ORDER BY p.id
+    ''', {'bed': bed_id, 'x': x, 'y': y, 'x2': x + width, 'y2': y + height, 'exclude': exclude_id}).fetchall()
+
+def overlap_error(overlaps):
+    """409 response naming the plants a planting area collides with"""
+    names = ', '.join(f"{row['name']} (#{row['id']})" for row in overlaps)
+    return jsonify({
+        'error': f'Planting area overlaps {names}',
+        'overlaps': [row['id'] for row in overlaps],
+    }), 409
+
+def render_bed(bed, bed_plants):
+    """Render one garden bed's SVG fragment"""
+    plants = []
+    for plant in bed_plants:
+        plant_dict = dict(plant)
+        plant_dict['icon'] = plant_icon(plant)
+        plant_dict['planting_area_json'] = plant_area(plant)
+        plants.append(plant_dict)
+    return Markup(BED_FRAGMENT.render(bed=bed, bed_plants=plants))
+
+def render_plant_card(plant, today_day):
+    """Render one plant card fragment"""
+    plant_dict = dict(plant)
+    last_day = plant['last_watered_day']
+    plant_dict['days_ago'] = format_days_ago(None if last_day is None else today_day - last_day)
+    return Markup(PLANT_CARD_FRAGMENT.render(plant=plant_dict))
+
+def cached_fragment(key, version, render):
+    """Return the cached fragment for key if it was rendered at version, else render it"""
+    cached = fragment_cache.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    html = render()
+    fragment_cache.set(key, (version, html))
+    return html
+
+def plant_card_html(plant, versions, today_day):
+    """Card fragment for a plant row, from the cache when its bed hasn't changed"""
+    version = (versions.get(bed_version_key(plant['bed_id']), 0), today_day)
+    return cached_fragment(
+        (current_database(), 'card', plant['id']), version,
+        lambda: render_plant_card(plant, today_day)
+    )
+
+def bed_html(bed, bed_plants, versions):
+    """Bed fragment, from the cache when the bed hasn't changed"""
+    return cached_fragment(
+        (current_database(), 'bed', bed['id']), versions.get(bed_version_key(bed['id']), 0),
+        lambda: render_bed(bed, bed_plants)
+    )
+
+def render_schedule_item(entry):
+    """Render one watering schedule entry"""
+    return Markup(SCHEDULE_ITEM_FRAGMENT.render(item=entry))
+
+def plant_update_payload(conn, revision, plant_id, *bed_ids):
+    """Everything the page needs to patch itself after a write to one plant"""
+    today_day = date.today().toordinal()
+    versions = get_bed_versions(conn)
+    payload = {
+        'success': True,
+        'revision': revision,
+        'plant_id': plant_id,
+        'plant': None,
+        'card_html': None,
+        'schedule_entry': None,
+        'schedule_html': None,
+        'beds': [],
+    }
+
+    plant = conn.execute('SELECT * FROM plants WHERE id = ?', (plant_id,)).fetchone()
+    if plant is not None:
+        payload['plant'] = dict(plant)
+        payload['card_html'] = str(plant_card_html(plant, versions, today_day))
+        if plant['watering_interval_days'] is not None:
+            entry = build_schedule_entry(plant, today_day, plant_icon(plant), garden_rain(conn)[0])
+            payload['schedule_entry'] = entry
+            payload['schedule_html'] = str(render_schedule_item(entry))
+
+    for bed_id in sorted({bed_id for bed_id in bed_ids if bed_id is not None}):
+        bed = conn.execute('SELECT * FROM beds WHERE id = ?', (bed_id,)).fetchone()
+        bed_plants = conn.execute('SELECT * FROM plants WHERE bed_id = ? ORDER BY id DESC', (bed_id,)).fetchall()
+        payload['beds'].append({
+            'id': bed_id, 'row': bed['grid_row'], 'col': bed['grid_col'],
+            'html': str(bed_html(bed, bed_plants, versions)),
+        })
+    return payload
+
+class EventBus:
+    """In-process fan-out of plant change events with a replayable history.
+
+    Subscribers don't get their own queue or thread: they wait on one shared
+    condition and read from a ring buffer by sequence number, so an idle
+    subscriber costs nothing but a parked wait.
+    """
+
+    def __init__(self, history):
+        self._events = deque(maxlen=history)
+        self._floor = None  # highest sequence we can no longer replay
+        self.subscribers = 0
+        self.lock = threading.Condition()
+
+    def subscribe(self):
+        with self.lock:
+            self.subscribers += 1
+
+    def unsubscribe(self):
+        with self.lock:
+            self.subscribers -= 1
+
+    def publish(self, seq, event_type, data):
+        """Append an event; callers must publish in sequence order"""
+        with self.lock:
+            if self._floor is None:
+                self._floor = seq - 1
+            if len(self._events) == self._events.maxlen:
+                self._floor = self._events[0][0]
+            self._events.append((seq, event_type, data))
+            self.lock.notify_all()
+
+    def start(self, current_seq):
+        """Record where history begins if nothing has been published yet"""
+        with self.lock:
+            if self._floor is None:
+                self._floor = current_seq
+
+    def since(self, seq, timeout=None):
+        """Events after seq, waiting up to timeout for one to arrive.
+
+        Returns None if events after seq have already been dropped from the
+        history, in which case the subscriber has to resynchronise.
+        """
+        with self.lock:
+            if self._floor is not None and seq < self._floor:
+                return None
+            if timeout and (not self._events or self._events[-1][0] <= seq):
+                self.lock.wait(timeout)
+            return [event for event in self._events if event[0] > seq]
+
+# One bus per garden database, since each garden numbers its own revisions;
+# least recently used first
+_garden_events = OrderedDict()
+_garden_events_lock = threading.Lock()
+
+def garden_events():
+    """Event bus for the current garden.
+
+    Like the connection pools, only GARDEN_POOL_LIMIT garden buses are kept
+    besides the main database's. Idle ones go first; a bus with open streams
+    is never dropped, and its garden's clients resync with a reset event
+    once a dropped bus is recreated.
+    """
+    path = current_database()
+    main = app.config['DATABASE']
+    with _garden_events_lock:
+        bus = _garden_events.get(path)
+        if bus is None:
+            bus = _garden_events[path] = EventBus(app.config['EVENT_HISTORY_SIZE'])
+        _garden_events.move_to_end(path)
+        excess = len(_garden_events) - app.config['GARDEN_POOL_LIMIT'] - (main in _garden_events)
+        for key in list(_garden_events):
+            if excess <= 0:
+                break
+            if key not in (main, path) and not _garden_events[key].subscribers:
+                del _garden_events[key]
+                excess -= 1
+    return bus
+
+@contextmanager
+def plant_write():
+    """Hold the garden's event bus lock around a plant write, from before its transaction opens.
+
+    Writes then commit and publish in revision order. Taking the lock first
+    means no writer waits for it while holding SQLite's write lock, where
+    under gevent another greenlet stuck in busy_timeout would stall the
+    whole worker.
+    """
+    with garden_events().lock:
+        yield
+
+def commit_and_publish(conn, event_type, revision, plant_id, *bed_ids):
+    """Commit a plant write made under plant_write(), then announce it to the garden's event stream subscribers.
+
+    The payload is built after the commit, since building it can yield
+    (garden_rain may start a weather refresh) and nothing may yield while
+    the write transaction is open.
+    """
+    bus = garden_events()
+    with bus.lock:
+        conn.commit()
+        payload = plant_update_payload(conn, revision, plant_id, *bed_ids)
+        bus.publish(revision, event_type, payload)
+    return payload
+
+def format_sse(seq, event_type, data):
+    """Encode one Server-Sent Event"""
+    return f'id: {seq}\nevent: {event_type}\ndata: {json.dumps(data)}\n\n'
+
+def format_days_ago(days):
+    """Describe a day count the way the plant cards show it"""
+    if days is None:
+        return "Unknown"
+    if days == 0:
+        return "Today"
+    elif days == 1:
+        return "Yesterday"
+    else:
+        return f"{days} days ago"
+
+FREQUENCY_NUMBER_RE = re.compile(r'(\d+)')
 
 def parse_watering_frequency(freq_str):
     """Parse watering frequency string to get days interval"""
@@ -1323,313 +1204,1617 @@ def parse_watering_frequency(freq_str):
     if 'daily' in freq_lower or 'every day' in freq_lower:
         return 1
     elif 'week' in freq_lower:
-        import re
-        match = re.search(r'(\d+)', freq_lower)
+        match = FREQUENCY_NUMBER_RE.search(freq_lower)
         if match:
             return int(match.group(1)) * 7
         return 7
     elif 'day' in freq_lower:
-        import re
-        match = re.search(r'(\d+)', freq_lower)
+        match = FREQUENCY_NUMBER_RE.search(freq_lower)
         if match:
             return int(match.group(1))
     return None
 
-@app.route('/')
+def parse_day(date_str):
+    """Convert a YYYY-MM-DD string to a day ordinal, or None if it doesn't parse"""
+    try:
+        return datetime.strptime(date_str, '%Y-%m-%d').date().toordinal()
+    except (TypeError, ValueError):
+        return None
+
+def schedule_fields(watering_frequency, last_watered):
+    """Typed schedule columns stored alongside the free-text fields"""
+    interval = parse_watering_frequency(watering_frequency)
+    last_day = parse_day(last_watered)
+    next_due = last_day + interval if interval and last_day is not None else None
+    return {
+        'watering_interval_days': interval,
+        'last_watered_day': last_day,
+        'next_due_day': next_due,
+    }
+
+def schedule_entry(plant, today_day, icon, result):
+    """Schedule item for a plant row from its watering_schedule result tuple"""
+    last_day, next_due_day, days_since, status, status_text, rain_inches = result
+    rain_note = None
+    if rain_inches is not None:
+        rain_note = f'{rain_inches:.1f}" rain ' + ('expected' if last_day > today_day else 'counted')
+    return {
+        'id': plant['id'],
+        'name': plant['name'],
+        'location': plant['location'],
+        'days_ago': format_days_ago(None if plant['last_watered_day'] is None else today_day - plant['last_watered_day']),
+        'watering_frequency': plant['watering_frequency'],
+        'status': status,
+        'status_text': status_text,
+        'icon': icon,
+        'days_since': days_since,
+        'next_due_day': next_due_day,
+        'rain_note': rain_note
+    }
+
+def build_schedule_entry(plant, today_day, icon, rain_days=()):
+    """Schedule item for a plant row carrying the typed schedule columns, with any rain credit applied"""
+    result = watering_schedule.schedule_one(
+        plant['watering_interval_days'], plant['last_watered_day'], today_day, rain_days
+    )
+    return schedule_entry(plant, today_day, icon, result)
+
+# The last schedule built for each garden database, as (key, rendered rows); see get_schedule
+schedule_cache = LRUCache(app.config['GARDEN_POOL_LIMIT'])
+
+def get_schedule(conn, today_day, revision, rain):
+    """Every scheduled plant's rendered schedule row, most urgent first, computed for the whole garden in one batch.
+
+    Cached until a plant write, a new day or a weather refresh changes the inputs.
+    """
+    rain_days, weather_tag = rain
+    path = current_database()
+    key = (revision, today_day, weather_tag)
+    cached = schedule_cache.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    rows = conn.execute('''
+        SELECT id, name, type, icon, location, watering_frequency,
+               watering_interval_days, last_watered_day
+        FROM plants
+        WHERE watering_interval_days IS NOT NULL
+    ''').fetchall()
+    batch = watering_schedule.schedule_many(
+        [plant['id'] for plant in rows],
+        [plant['watering_interval_days'] for plant in rows],
+        [plant['last_watered_day'] for plant in rows],
+        today_day,
+        rain_days,
+    )
+    # Rendering costs more than the scheduling, so the cache keeps the HTML
+    items = [
+        render_schedule_item(schedule_entry(rows[i], today_day, plant_icon(rows[i]), batch.result(i)))
+        for i in batch.order
+    ]
+
+    schedule_cache.set(path, (key, items))
+    return items
+
+# Routes for one garden's plants and beds. They're registered twice: at /
+# for the default garden, and under /gardens/<garden_id>/ for the others.
+garden_routes = Blueprint('garden', __name__)
+
+@garden_routes.url_value_preprocessor
+def pull_garden_id(endpoint, values):
+    """Take the garden id out of the URL so views work on g.garden_id"""
+    g.garden_id = (values or {}).pop('garden_id', DEFAULT_GARDEN)
+
+@garden_routes.before_request
+def check_garden():
+    """404 for malformed garden ids and gardens without a shard, before anything opens one"""
+    if g.garden_id == DEFAULT_GARDEN:
+        return None
+    if not GARDEN_ID_RE.fullmatch(g.garden_id) or not os.path.exists(garden_database(g.garden_id)):
+        return jsonify({'error': 'Garden not found'}), 404
+
+def garden_url_prefix():
+    """URL prefix of the current garden's routes, empty for the default garden"""
+    return '' if g.garden_id == DEFAULT_GARDEN else f'/gardens/{g.garden_id}'
+
+@garden_routes.route('/')
 def index():
     """Main page"""
     conn = get_db()
+    today_day = date.today().toordinal()
+    # "Last watered" text is relative to today, so the day is part of the tag
+    revision = get_revision(conn)
+    rain = garden_rain(conn)
+    etag = f'{TEMPLATE_VERSION}-{revision}-{today_day}-{rain[1]}'
+    cached = not_modified(etag)
+    if cached is not None:
+        return add_validators(cached, etag)
+
     cursor = conn.cursor()
     cursor.execute('SELECT * FROM plants ORDER BY id DESC')
     plants = cursor.fetchall()
-    conn.close()
-    
-    plants_list = []
-    beds = {}  # Dictionary to organize plants by bed position
-    
-    # Plant type to emoji mapping
-    plant_icons = {
-        'tomato': '🍅',
-        'pepper': '🌶️',
-        'lettuce': '🥬',
-        'carrot': '🥕',
-        'cucumber': '🥒',
-        'strawberry': '🍓',
-        'corn': '🌽',
-        'potato': '🥔',
-        'onion': '🧅',
-        'garlic': '🧄',
-        'bean': '🫘',
-        'pea': '🫛',
-        'squash': '🎃',
-        'pumpkin': '🎃',
-        'watermelon': '🍉',
-        'melon': '🍈',
-        'rose': '🌹',
-        'sunflower': '🌻',
-        'tulip': '🌷',
-        'herb': '🌿',
-        'basil': '🌿',
-        'mint': '🌿',
-        'default': '🌱'
-    }
+    versions = get_bed_versions(conn)
     
+    bed_plants = {}  # plants grouped by bed_id
+    plant_cards = []
     for plant in plants:
-        plant_dict = dict(plant)
-        plant_dict['days_ago'] = get_days_ago(plant['last_watered'])
-        
-        # Assign icon based on plant type
-        plant_type_lower = (plant['type'] or '').lower()
-        icon = plant_icons.get('default')
-        for key, emoji in plant_icons.items():
-            if key in plant_type_lower:
-                icon = emoji
-                break
-        plant_dict['icon'] = icon
-        
-        # Parse planting area JSON
-        import json
-        if plant['planting_area']:
-            try:
-                plant_dict['planting_area_json'] = json.loads(plant['planting_area'])
-            except:
-                plant_dict['planting_area_json'] = None
-        else:
-            plant_dict['planting_area_json'] = None
-        
-        plants_list.append(plant_dict)
-        
-        # Organize by bed
-        bed_row = plant['bed_row'] if 'bed_row' in plant.keys() else None
-        bed_col = plant['bed_col'] if 'bed_col' in plant.keys() else None
-        if bed_row is not None and bed_col is not None:
-            bed_key = (bed_row, bed_col)
-            if bed_key not in beds:
-                beds[bed_key] = []
-            beds[bed_key].append(plant_dict)
-
-    # Generate watering schedule
-    schedule = []
-    import json
-    for plant in plants:
-        freq = parse_watering_frequency(plant['watering_frequency'])
-        if freq:
-            days_since = get_days_since(plant['last_watered'])
-
-            # Determine status and time remaining
-            days_until_next_watering = freq - days_since
-
-            if days_since >= freq:
-                status = 'overdue'
-                days_overdue = days_since - freq
-                if days_overdue == 0:
-                    status_text = 'Water Today (Due)'
-                elif days_overdue == 1:
-                    status_text = 'Overdue by 1 day'
-                else:
-                    status_text = f'Overdue by {days_overdue} days'
-            elif days_until_next_watering == 1:
-                status = 'today'
-                status_text = 'Water Today'
-            elif days_until_next_watering == 0:
-                status = 'today'
-                status_text = 'Water Today (Due Now)'
-            else:
-                status = 'upcoming'
-                if days_until_next_watering == 1:
-                    status_text = 'Water in 1 day'
-                else:
-                    status_text = f'Water in {days_until_next_watering} days'
-
-            # Get icon
-            plant_type_lower = (plant['type'] or '').lower()
-            icon = plant_icons.get('default')
-            for key, emoji in plant_icons.items():
-                if key in plant_type_lower:
-                    icon = emoji
-                    break
-
-            schedule.append({
-                'id': plant['id'],
-                'name': plant['name'],
-                'location': plant['location'],
-                'days_ago': get_days_ago(plant['last_watered']),
-                'watering_frequency': plant['watering_frequency'],
-                'status': status,
-                'status_text': status_text,
-                'icon': icon,
-                'days_since': days_since
-            })
-
-    # Sort by urgency: overdue first, then today, then upcoming
-    schedule.sort(key=lambda x: (0 if x['status'] == 'overdue' else 1 if x['status'] == 'today' else 2, x['days_since']), reverse=True)
-
-    return render_template_string(HTML_TEMPLATE, plants=plants_list, beds=beds, schedule=schedule, today=str(date.today()))
-
-@app.route('/api/plants', methods=['POST'])
+        plant_cards.append(plant_card_html(plant, versions, today_day))
+        if plant['bed_id'] is not None:
+            bed_plants.setdefault(plant['bed_id'], []).append(plant)
+
+    # Unchanged beds are served straight from the fragment cache
+    beds = get_beds(conn)
+    bed_fragments = [bed_html(bed, bed_plants.get(bed['id'], []), versions) for bed in beds]
+    layout_columns = max((bed['grid_col'] + 1 for bed in beds), default=1)
+
+    # Watering schedule, most urgent first, with recent and forecast rain credited
+    schedule = get_schedule(conn, today_day, revision, rain)
+
+    page = render_template(INDEX_TEMPLATE, plant_cards=plant_cards, bed_fragments=bed_fragments, layout_columns=layout_columns, schedule=schedule, today=str(date.today()), revision=revision, api_base=garden_url_prefix())
+    return add_validators(app.make_response(page), etag)
+
+@app.route('/assets/<filename>')
+def static_asset(filename):
+    """Serve a fingerprinted static asset in the best encoding the client accepts"""
+    asset = ASSETS_BY_URL.get(filename)
+    if asset is None:
+        return jsonify({'error': 'Asset not found'}), 404
+
+    encoding = 'identity'
+    for candidate in ('br', 'gzip'):
+        if candidate in asset.variants and request.accept_encodings[candidate]:
+            encoding = candidate
+            break
+
+    response = app.response_class(asset.variants[encoding], mimetype=asset.mimetype)
+    if encoding != 'identity':
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = ASSET_CACHE_CONTROL
+    response.set_etag(f'{asset.digest}-{encoding}')
+    return response
+
+def page_args():
+    """(limit, cursor id or None) for a keyset page; raises ValueError with a message for the client"""
+    try:
+        limit = int(request.args.get('limit', app.config['PLANTS_PAGE_SIZE']))
+        cursor_id = request.args.get('cursor')
+        cursor_id = int(cursor_id) if cursor_id else None
+    except ValueError:
+        raise ValueError('limit and cursor must be integers')
+    if limit < 1:
+        raise ValueError('limit must be positive')
+    return min(limit, app.config['PLANTS_MAX_PAGE_SIZE']), cursor_id
+
+@garden_routes.route('/api/plants', methods=['GET'])
+def list_plants():
+    """List plants newest first, one keyset page at a time"""
+    try:
+        limit, cursor_id = page_args()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    conn = get_db()
+    available = [row['name'] for row in conn.execute('PRAGMA table_info(plants)')]
+    fields = request.args.get('fields')
+    if fields:
+        columns = [name.strip() for name in fields.split(',') if name.strip()]
+        unknown = [name for name in columns if name not in available]
+        if unknown:
+            return jsonify({'error': f"Unknown fields: {', '.join(unknown)}"}), 400
+        # The id is always returned, it's what the next cursor is built from
+        if 'id' not in columns:
+            columns.insert(0, 'id')
+    else:
+        columns = available
+
+    # Column names are checked against the table above, so they're safe to inline
+    sql = f"SELECT {', '.join(columns)} FROM plants"
+    params = []
+    if cursor_id is not None:
+        sql += ' WHERE id < ?'
+        params.append(cursor_id)
+    sql += ' ORDER BY id DESC LIMIT ?'
+    params.append(limit + 1)
+    rows = conn.execute(sql, params).fetchall()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return jsonify({
+        'plants': [dict(row) for row in rows],
+        'next_cursor': rows[-1]['id'] if has_more else None,
+    })
+
+@garden_routes.route('/api/plants', methods=['POST'])
 def add_plant():
     """Add new plant"""
     data = request.json
+    last_watered = str(date.today())
+    schedule = schedule_fields(data.get('watering_frequency'), last_watered)
+    area = area_columns(data.get('planting_area'))
     conn = get_db()
-    conn.execute('''
-        INSERT INTO plants (name, type, planted_date, location, watering_frequency, last_watered, bed_row, bed_col, planting_area,
-                           scientific_name, sunlight, watering_needs, cycle, hardiness_zones, description, perenual_id)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
-        data.get('name'),
-        data.get('type'),
-        data.get('planted_date'),
-        f"Bed {int(data.get('bed_row', 0)) * 3 + int(data.get('bed_col', 0)) + 1}",
-        data.get('watering_frequency'),
-        str(date.today()),
-        data.get('bed_row'),
-        data.get('bed_col'),
-        data.get('planting_area'),
-        data.get('scientific_name'),
-        data.get('sunlight'),
-        data.get('watering_needs'),
-        data.get('cycle'),
-        data.get('hardiness_zones'),
-        data.get('description'),
-        data.get('perenual_id')
-    ))
-    conn.commit()
-    conn.close()
-    return jsonify({'success': True})
-
-@app.route('/api/plants/<int:plant_id>/water', methods=['POST'])
+    try:
+        bed_id, location, bed_row, bed_col = bed_placement(find_bed(conn, data))
+    except (LookupError, ValueError):
+        return jsonify({'error': 'Unknown bed'}), 400
+    with plant_write():
+        cursor = conn.execute('''
+            INSERT INTO plants (name, type, icon, planted_date, location, watering_frequency, last_watered, bed_id, bed_row, bed_col, planting_area,
+                               area_x, area_y, area_width, area_height,
+                               scientific_name, sunlight, watering_needs, cycle, hardiness_zones, description, perenual_id,
+                               watering_interval_days, last_watered_day, next_due_day)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            data.get('name'),
+            data.get('type'),
+            get_plant_icon(data.get('type')),
+            data.get('planted_date'),
+            location,
+            data.get('watering_frequency'),
+            last_watered,
+            bed_id,
+            bed_row,
+            bed_col,
+            stored_planting_area(data.get('planting_area')),
+            *area,
+            data.get('scientific_name'),
+            data.get('sunlight'),
+            data.get('watering_needs'),
+            data.get('cycle'),
+            data.get('hardiness_zones'),
+            data.get('description'),
+            data.get('perenual_id'),
+            schedule['watering_interval_days'],
+            schedule['last_watered_day'],
+            schedule['next_due_day']
+        ))
+        # Checked inside the write transaction, so two requests can't claim the same spot
+        overlaps = find_overlaps(conn, bed_id, area, cursor.lastrowid)
+        if overlaps:
+            conn.rollback()
+            return overlap_error(overlaps)
+        enrich = needs_enrichment(data)
+        if enrich:
+            enqueue_enrichment(conn, cursor.lastrowid, data.get('perenual_id'))
+        revision = record_plant_write(conn, bed_id)
+        payload = commit_and_publish(conn, 'created', revision, cursor.lastrowid, bed_id)
+    if enrich:
+        notify_enrichment(g.garden_id)
+    return jsonify(payload)
+
+@garden_routes.route('/api/plants/<int:plant_id>/water', methods=['POST'])
 def water_plant(plant_id):
     """Water a plant"""
+    today = date.today()
     conn = get_db()
-    conn.execute('UPDATE plants SET last_watered = ? WHERE id = ?', (str(date.today()), plant_id))
-    conn.commit()
-    conn.close()
-    return jsonify({'success': True})
-
-@app.route('/api/plants/<int:plant_id>', methods=['GET'])
+    plant = get_plant_bed(conn, plant_id)
+    if plant is None:
+        return jsonify({'error': 'Plant not found'}), 404
+    with plant_write():
+        revision = record_plant_write(conn, plant['bed_id'])
+        conn.execute('''
+            UPDATE plants
+            SET last_watered = ?, last_watered_day = ?, next_due_day = ? + watering_interval_days
+            WHERE id = ?
+        ''', (str(today), today.toordinal(), today.toordinal(), plant_id))
+        return jsonify(commit_and_publish(conn, 'watered', revision, plant_id, plant['bed_id']))
+
+@garden_routes.route('/api/plants/<int:plant_id>', methods=['GET'])
 def get_plant(plant_id):
     """Get a single plant"""
     conn = get_db()
+    etag = f'plant-{plant_id}-{get_revision(conn)}'
+    cached = not_modified(etag)
+    if cached is not None:
+        return add_validators(cached, etag)
+
     cursor = conn.cursor()
     cursor.execute('SELECT * FROM plants WHERE id = ?', (plant_id,))
     plant = cursor.fetchone()
-    conn.close()
     if plant:
-        return jsonify(dict(plant))
+        return add_validators(jsonify(dict(plant)), etag)
     return jsonify({'error': 'Plant not found'}), 404
 
-@app.route('/api/plants/<int:plant_id>', methods=['PUT'])
+@garden_routes.route('/api/plants/<int:plant_id>', methods=['PUT'])
 def update_plant(plant_id):
     """Update a plant"""
     data = request.json
+    interval = parse_watering_frequency(data.get('watering_frequency'))
+    area = area_columns(data.get('planting_area'))
     conn = get_db()
-    conn.execute('''
-        UPDATE plants
-        SET name = ?, type = ?, planted_date = ?, location = ?,
-            watering_frequency = ?, bed_row = ?, bed_col = ?, planting_area = ?,
-            scientific_name = ?, sunlight = ?, watering_needs = ?, cycle = ?,
-            hardiness_zones = ?, description = ?, perenual_id = ?
-        WHERE id = ?
-    ''', (
-        data.get('name'),
-        data.get('type'),
-        data.get('planted_date'),
-        f"Bed {int(data.get('bed_row', 0)) * 3 + int(data.get('bed_col', 0)) + 1}",
-        data.get('watering_frequency'),
-        data.get('bed_row'),
-        data.get('bed_col'),
-        data.get('planting_area'),
-        data.get('scientific_name'),
-        data.get('sunlight'),
-        data.get('watering_needs'),
-        data.get('cycle'),
-        data.get('hardiness_zones'),
-        data.get('description'),
-        data.get('perenual_id'),
-        plant_id
-    ))
-    conn.commit()
-    conn.close()
-    return jsonify({'success': True})
+    old = conn.execute(
+        'SELECT bed_id, area_x, area_y, area_width, area_height FROM plants WHERE id = ?', (plant_id,)
+    ).fetchone()
+    if old is None:
+        return jsonify({'error': 'Plant not found'}), 404
+    try:
+        bed_id, location, bed_row, bed_col = bed_placement(find_bed(conn, data))
+    except (LookupError, ValueError):
+        return jsonify({'error': 'Unknown bed'}), 400
+    with plant_write():
+        revision = record_plant_write(conn, old['bed_id'], bed_id)
+        conn.execute('''
+            UPDATE plants
+            SET name = ?, type = ?, icon = ?, planted_date = ?, location = ?,
+                watering_frequency = ?, bed_id = ?, bed_row = ?, bed_col = ?, planting_area = ?,
+                area_x = ?, area_y = ?, area_width = ?, area_height = ?,
+                scientific_name = ?, sunlight = ?, watering_needs = ?, cycle = ?,
+                hardiness_zones = ?, description = ?, perenual_id = ?,
+                watering_interval_days = ?, next_due_day = last_watered_day + ?
+            WHERE id = ?
+        ''', (
+            data.get('name'),
+            data.get('type'),
+            get_plant_icon(data.get('type')),
+            data.get('planted_date'),
+            location,
+            data.get('watering_frequency'),
+            bed_id,
+            bed_row,
+            bed_col,
+            stored_planting_area(data.get('planting_area')),
+            *area,
+            data.get('scientific_name'),
+            data.get('sunlight'),
+            data.get('watering_needs'),
+            data.get('cycle'),
+            data.get('hardiness_zones'),
+            data.get('description'),
+            data.get('perenual_id'),
+            interval,
+            interval,
+            plant_id
+        ))
+        # Only a plant that moved is checked, so one left overlapping from before
+        # areas were checked can still be edited in place
+        if (bed_id, *area) != tuple(old):
+            overlaps = find_overlaps(conn, bed_id, area, plant_id)
+            if overlaps:
+                conn.rollback()
+                return overlap_error(overlaps)
+        enrich = needs_enrichment(data)
+        if enrich:
+            enqueue_enrichment(conn, plant_id, data.get('perenual_id'))
+        else:
+            conn.execute('DELETE FROM enrichment_jobs WHERE plant_id = ?', (plant_id,))
+        payload = commit_and_publish(conn, 'updated', revision, plant_id, old['bed_id'], bed_id)
+    if enrich:
+        notify_enrichment(g.garden_id)
+    return jsonify(payload)
 
-@app.route('/api/plants/<int:plant_id>', methods=['DELETE'])
+@garden_routes.route('/api/plants/<int:plant_id>', methods=['DELETE'])
 def delete_plant(plant_id):
     """Delete a plant"""
     conn = get_db()
-    conn.execute('DELETE FROM plants WHERE id = ?', (plant_id,))
+    plant = get_plant_bed(conn, plant_id)
+    if plant is None:
+        return jsonify({'error': 'Plant not found'}), 404
+    with plant_write():
+        revision = record_plant_write(conn, plant['bed_id'])
+        conn.execute('DELETE FROM plants WHERE id = ?', (plant_id,))
+        conn.execute('DELETE FROM enrichment_jobs WHERE plant_id = ?', (plant_id,))
+        return jsonify(commit_and_publish(conn, 'deleted', revision, plant_id, plant['bed_id']))
+
+@garden_routes.route('/api/beds', methods=['GET'])
+def list_beds():
+    """List beds by id with per-bed plant, overdue and planted-area totals, one keyset page at a time"""
+    try:
+        limit, cursor_id = page_args()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    conn = get_db()
+    today_day = date.today().toordinal()
+    rain_days, rain_tag = garden_rain(conn)
+    etag = f'beds-{cursor_id}-{limit}-{get_revision(conn)}-{today_day}-{rain_tag}'
+    cached = not_modified(etag)
+    if cached is not None:
+        return add_validators(cached, etag)
+
+    # Page the beds first so the aggregate only reads their plants, through idx_plants_bed_id
+    rows = conn.execute('''
+        SELECT b.*,
+               COUNT(p.id) AS plant_count,
+               COALESCE(SUM(p.area_width * p.area_height), 0) / 100.0 AS area_used_percent
+        FROM (SELECT * FROM beds WHERE id > :cursor ORDER BY id LIMIT :limit) AS b
+        LEFT JOIN plants p ON p.bed_id = b.id
+        GROUP BY b.id
+        ORDER BY b.id
+    ''', {'cursor': cursor_id or 0, 'limit': limit + 1}).fetchall()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    # Overdue as the schedule shows it: rain credit applied, never-watered plants included
+    overdue = {}
+    if rows:
+        plants = conn.execute('''
+            SELECT id, bed_id, watering_interval_days, last_watered_day
+            FROM plants
+            WHERE bed_id BETWEEN ? AND ? AND watering_interval_days IS NOT NULL
+        ''', (rows[0]['id'], rows[-1]['id'])).fetchall()
+        batch = watering_schedule.schedule_many(
+            [plant['id'] for plant in plants],
+            [plant['watering_interval_days'] for plant in plants],
+            [plant['last_watered_day'] for plant in plants],
+            today_day,
+            rain_days,
+        )
+        for plant, status in zip(plants, batch.status):
+            if status == 'overdue':
+                overdue[plant['bed_id']] = overdue.get(plant['bed_id'], 0) + 1
+
+    return add_validators(jsonify({
+        'beds': [dict(row, overdue_count=overdue.get(row['id'], 0)) for row in rows],
+        'next_cursor': rows[-1]['id'] if has_more else None,
+    }), etag)
+
+@garden_routes.route('/api/beds', methods=['POST'])
+def add_bed():
+    """Add a bed to the layout"""
+    data = request.json
+    try:
+        name = str(data['name']).strip()
+        grid_row, grid_col = int(data['grid_row']), int(data['grid_col'])
+        width_ft, length_ft = float(data.get('width_ft', 4)), float(data.get('length_ft', 8))
+    except (KeyError, TypeError, ValueError):
+        return jsonify({'error': 'name, grid_row and grid_col are required; sizes must be numbers'}), 400
+    if not name or grid_row < 0 or grid_col < 0 or width_ft <= 0 or length_ft <= 0:
+        return jsonify({'error': 'Bed needs a name, a grid position of 0 or more and a positive size'}), 400
+
+    conn = get_db()
+    try:
+        bed_id = conn.execute('''
+            INSERT INTO beds (name, grid_row, grid_col, width_ft, length_ft) VALUES (?, ?, ?, ?, ?)
+        ''', (name, grid_row, grid_col, width_ft, length_ft)).lastrowid
+    except sqlite3.IntegrityError:
+        conn.rollback()
+        return jsonify({'error': 'A bed already occupies that grid position'}), 409
+    revision = record_plant_write(conn, bed_id)
     conn.commit()
-    conn.close()
-    return jsonify({'success': True})
+    row = conn.execute('SELECT * FROM beds WHERE id = ?', (bed_id,)).fetchone()
+    return jsonify({'success': True, 'revision': revision, 'bed': dict(row)})
+
+@garden_routes.route('/api/beds/<int:bed_id>/plants/at', methods=['GET'])
+def plants_at_point(bed_id):
+    """Plants whose planting area covers the point (x, y) in a bed, in percent of the bed"""
+    try:
+        x, y = float(request.args['x']), float(request.args['y'])
+    except (KeyError, ValueError):
+        return jsonify({'error': 'x and y must be numbers'}), 400
+    conn = get_db()
+    etag = f'plants-at-{bed_id}-{x}-{y}-{get_revision(conn)}'
+    cached = not_modified(etag)
+    if cached is not None:
+        return add_validators(cached, etag)
+
+    # Edges count as inside, so a point on a shared border finds both plants
+    rows = conn.execute('''
+        SELECT p.id, p.name, p.type, p.icon, p.planting_area
+        FROM plant_areas a JOIN plants p ON p.id = a.id
+        WHERE a.min_bed <= :bed AND a.max_bed >= :bed
+          AND a.min_x <= :x AND a.max_x >= :x AND a.min_y <= :y AND a.max_y >= :y
+          AND p.area_x <= :x AND p.area_x + p.area_width >= :x
+          AND p.area_y <= :y AND p.area_y + p.area_height >= :y
+        ORDER BY p.id
+    ''', {'bed': bed_id, 'x': x, 'y': y}).fetchall()
+    return add_validators(jsonify({'plants': [dict(row, icon=plant_icon(row)) for row in rows]}), etag)
+
+@garden_routes.route('/api/events', methods=['GET'])
+def plant_event_stream():
+    """Server-Sent Events stream of plant changes, resumable by sequence number"""
+    last_seen = request.headers.get('Last-Event-ID') or request.args.get('since')
+    current = get_revision(get_db())
+    bus = garden_events()
+    bus.start(current)
+    try:
+        seq = int(last_seen) if last_seen else current
+    except ValueError:
+        return jsonify({'error': 'since must be an integer'}), 400
+    heartbeat = app.config['EVENT_HEARTBEAT_SECONDS']
+
+    def stream():
+        nonlocal seq
+        bus.subscribe()
+        try:
+            yield 'retry: 3000\n\n'
+            while True:
+                events = bus.since(seq, timeout=heartbeat)
+                if events is None:
+                    # The client is too far behind to replay; it has to reload
+                    yield format_sse(current, 'reset', {})
+                    return
+                for event_seq, event_type, data in events:
+                    seq = event_seq
+                    yield format_sse(event_seq, event_type, data)
+                if not events:
+                    yield ': keepalive\n\n'
+        finally:
+            bus.unsubscribe()
+
+    return Response(stream(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+    })
+
+class Counters:
+    """Thread-safe named counters reported by the status endpoint"""
+
+    def __init__(self):
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            self._counts[name] = self._counts.get(name, 0) + amount
+
+    def get(self, name):
+        return self._counts.get(name, 0)
+
+perenual_metrics = Counters()
+
+# A cache hit only rewrites last_used when it's older than this, so hot
+# queries don't turn every read into a write
+SEARCH_CACHE_TOUCH_SECONDS = 60
+
+def normalize_query(query):
+    """Cache key for a search: lowercased with whitespace collapsed"""
+    return ' '.join(query.lower().split())
+
+def format_search_result(plant):
+    """Trim a Perenual species-list entry to what the frontend uses"""
+    return {
+        'id': plant.get('id'),
+        'common_name': plant.get('common_name'),
+        'scientific_name': plant.get('scientific_name', [''])[0] if plant.get('scientific_name') else '',
+        'sunlight': ', '.join(plant.get('sunlight', [])) if plant.get('sunlight') else None,
+        'watering': plant.get('watering'),
+        'cycle': plant.get('cycle'),
+        'image': plant.get('default_image', {}).get('thumbnail') if plant.get('default_image') else None
+    }
+
+# Upstream statuses worth another try: throttling and server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+class JitteredRetry(Retry):
+    """Retry whose exponential backoff is spread uniformly over [0, backoff]"""
+
+    def get_backoff_time(self):
+        backoff = super().get_backoff_time()
+        return random.uniform(0, backoff) if backoff else 0
+
+def make_http_session(retries):
+    """A keep-alive session with a bounded connection pool that retries 429s and 5xx up to retries times"""
+    retry = JitteredRetry(
+        total=retries,
+        # A read timeout may mean the server is still working on it; don't pile
+        # on. False raises it as a ReadTimeout rather than a retry error
+        read=False,
+        backoff_factor=app.config['HTTP_BACKOFF_FACTOR'],
+        backoff_max=app.config['HTTP_BACKOFF_FACTOR'] * 2 ** app.config['HTTP_RETRIES'],
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(['GET']),
+        # A long Retry-After would hold the calling thread; our own backoff is capped
+        respect_retry_after_header=False,
+        # Hand the last response back so raise_for_status() reports it
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=app.config['HTTP_POOL_SIZE'],
+        pool_maxsize=app.config['HTTP_POOL_SIZE'],
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+http_session = make_http_session(app.config['HTTP_RETRIES'])
+# Perenual calls retry in perenual_get instead, so every attempt fits one deadline
+perenual_session = make_http_session(0)
+
+class PerenualUnavailable(requests.RequestException):
+    """Raised instead of calling Perenual when we already know the call can't go out"""
+
+class CircuitBreaker:
+    """Fail fast once an upstream keeps failing or slowing down, probing it again after a pause"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold, slow_call_seconds, reset_seconds):
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.last_failure = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a call may go out now; in half-open state only one probe at a time does"""
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self.state = self.HALF_OPEN
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def release(self):
+        """Give back a probe claimed by allow() for a call that never went out"""
+        with self._lock:
+            self._probing = False
+
+    def record(self, duration, error=None):
+        """Record a finished call, with a short failure reason if it failed; slow calls count as failures"""
+        if error is None and duration > self.slow_call_seconds:
+            error = f'slow response ({duration:.1f}s)'
+        with self._lock:
+            self._probing = False
+            if error is None:
+                self.state = self.CLOSED
+                self.failures = 0
+                return
+            self.failures += 1
+            self.last_failure = error
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def snapshot(self):
+        with self._lock:
+            retry_in = None
+            if self.state == self.OPEN:
+                retry_in = max(0.0, self.reset_seconds - (time.monotonic() - self.opened_at))
+            return {
+                'state': self.state,
+                'consecutive_failures': self.failures,
+                'last_failure': self.last_failure,
+                'retry_in_seconds': retry_in,
+            }
+
+perenual_breaker = CircuitBreaker(
+    app.config['PERENUAL_BREAKER_FAILURES'],
+    app.config['PERENUAL_BREAKER_SLOW_SECONDS'],
+    app.config['PERENUAL_BREAKER_RESET_SECONDS'],
+)
+
+class TokenBucket:
+    """Allow rate calls per second on average, with bursts of up to capacity"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout):
+        """Take a token, waiting up to timeout seconds for one; False if none came"""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            if now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def refund(self):
+        """Give back a token taken for a call that never went out"""
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + 1)
+
+perenual_bucket = TokenBucket(app.config['PERENUAL_RATE_PER_SECOND'], app.config['PERENUAL_RATE_BURST'])
+
+def budget_key():
+    """app_meta key counting today's Perenual calls (UTC days)"""
+    return 'perenual_calls:' + time.strftime('%Y-%m-%d', time.gmtime())
+
+def get_budget(conn):
+    """Today's Perenual call budget: limit, calls used and calls left before cache-only mode"""
+    limit = app.config['PERENUAL_DAILY_BUDGET']
+    row = conn.execute('SELECT value FROM app_meta WHERE key = ?', (budget_key(),)).fetchone()
+    used = row['value'] if row else 0
+    if not limit:
+        return {'daily_limit': None, 'used': used, 'remaining': None, 'cache_only': False}
+    remaining = max(0, limit - used)
+    return {
+        'daily_limit': limit,
+        'used': used,
+        'remaining': remaining,
+        'cache_only': remaining <= app.config['PERENUAL_BUDGET_RESERVE'],
+    }
+
+def spend_budget(calls=1, reserve=True):
+    """Count calls against today's budget; with reserve, refuse (False) once only the reserve is left"""
+    limit = app.config['PERENUAL_DAILY_BUDGET']
+    # The upsert's WHERE only guards updates; the day's first call inserts
+    if reserve and limit and calls > limit - app.config['PERENUAL_BUDGET_RESERVE']:
+        return False
+    # Outbound calls also run on background threads, so use a connection of our own
+    with app.app_context():
+        conn = get_db()
+        key = budget_key()
+        if reserve and limit:
+            row = conn.execute('''
+                INSERT INTO app_meta (key, value) VALUES (?, ?)
+                ON CONFLICT(key) DO UPDATE SET value = value + excluded.value
+                WHERE value + excluded.value <= ?
+                RETURNING value
+            ''', (key, calls, limit - app.config['PERENUAL_BUDGET_RESERVE'])).fetchone()
+        else:
+            row = conn.execute('''
+                INSERT INTO app_meta (key, value) VALUES (?, ?)
+                ON CONFLICT(key) DO UPDATE SET value = value + excluded.value
+                RETURNING value
+            ''', (key, calls)).fetchone()
+        if row is not None and row['value'] == calls:
+            # First call of a new day; earlier days' counters are no longer needed
+            conn.execute("DELETE FROM app_meta WHERE key LIKE 'perenual_calls:%' AND key < ?", (key,))
+        conn.commit()
+        return row is not None
+
+def backoff_before_retry(attempts, deadline):
+    """Sleep a jittered backoff before another attempt; False when out of retries or out of time"""
+    if attempts > app.config['HTTP_RETRIES']:
+        return False
+    delay = random.uniform(0, app.config['HTTP_BACKOFF_FACTOR'] * 2 ** (attempts - 1))
+    if time.monotonic() + delay >= deadline:
+        return False
+    time.sleep(delay)
+    return True
+
+def upstream_error(e):
+    """Short, safe description of a failed Perenual call: the status or error type, never the URL
+
+    The message of a requests error includes the URL, and the URL the API key.
+    """
+    if isinstance(e, PerenualUnavailable):
+        return str(e)
+    status = e.response.status_code if e.response is not None else None
+    return f'HTTP {status}' if status else type(e).__name__
+
+def perenual_get(path, **params):
+    """GET a Perenual API path through the shared session and decode the JSON body.
+
+    The whole call, rate-limit wait and retries included, finishes within
+    PERENUAL_DEADLINE_SECONDS: each attempt's timeouts are cut to the time left.
+    """
+    deadline = time.monotonic() + app.config['PERENUAL_DEADLINE_SECONDS']
+    # Cheapest refusal first, so a call that can't go out never waits on the rate limiter
+    if not spend_budget():
+        perenual_metrics.incr('budget_rejections')
+        raise PerenualUnavailable('Daily Perenual budget spent; serving cached results only')
+    # An open circuit fails fast too, before any wait on the rate limiter
+    if not perenual_breaker.allow():
+        spend_budget(-1, reserve=False)
+        perenual_metrics.incr('breaker_rejections')
+        raise PerenualUnavailable('Perenual is unavailable (circuit open)')
+    if not perenual_bucket.acquire(min(app.config['PERENUAL_RATE_WAIT_SECONDS'], deadline - time.monotonic())):
+        perenual_breaker.release()
+        spend_budget(-1, reserve=False)
+        perenual_metrics.incr('rate_limited')
+        raise PerenualUnavailable('Too many Perenual lookups right now, try again shortly')
+
+    params['key'] = app.config['PERENUAL_API_KEY']
+    start = time.monotonic()
+    attempts = 0
+    try:
+        while True:
+            attempts += 1
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise requests.Timeout('Perenual call deadline passed')
+            try:
+                response = perenual_session.get(
+                    f"{app.config['PERENUAL_BASE_URL']}/{path}",
+                    params=params,
+                    timeout=(min(app.config['HTTP_CONNECT_TIMEOUT'], remaining),
+                             min(app.config['HTTP_READ_TIMEOUT'], remaining))
+                )
+            except requests.ConnectionError:
+                # Connection failures (connect timeouts included) are retried;
+                # read timeouts are not a ConnectionError and go straight out
+                if backoff_before_retry(attempts, deadline):
+                    continue
+                raise
+            if response.status_code in RETRY_STATUSES and backoff_before_retry(attempts, deadline):
+                continue
+            break
+        response.raise_for_status()
+    except requests.RequestException as e:
+        # A 4xx other than 429 means Perenual is up and answered; don't count it
+        status = e.response.status_code if e.response is not None else None
+        unhealthy = status is None or status == 429 or status >= 500
+        perenual_breaker.record(time.monotonic() - start, upstream_error(e) if unhealthy else None)
+        raise
+    else:
+        # Recorded before the budget write below, so a failing write can't strand a half-open probe
+        perenual_breaker.record(time.monotonic() - start)
+    finally:
+        # Retried attempts were real calls against the quota too, failed or not
+        if attempts > 1:
+            spend_budget(attempts - 1, reserve=False)
+    return response.json()
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key into one call whose outcome they all share"""
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self, name):
+        self.name = name
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self._Call()
+
+        if not leader:
+            perenual_metrics.incr(f'{self.name}_coalesced')
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        perenual_metrics.incr(f'{self.name}_upstream_calls')
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+species_search_flight = SingleFlight('search')
+species_details_flight = SingleFlight('details')
+
+def fetch_species_search(query):
+    """Search Perenual's species list, returning the top 10 formatted results"""
+    def fetch():
+        data = perenual_get('species-list', q=query)
+        return [format_search_result(plant) for plant in data.get('data', [])[:10]]
+    return species_search_flight.do(query, fetch)
+
+CATALOG_TOKEN_RE = re.compile(r'\w+')
+
+def search_catalog(conn, query_key, limit=10):
+    """Ranked prefix search of the offline species catalog"""
+    tokens = CATALOG_TOKEN_RE.findall(query_key)
+    if not tokens:
+        return []
+    # Every word must match the start of a term; quoting keeps FTS syntax out of user input
+    match = ' '.join(f'"{token}"*' for token in tokens)
+    rows = conn.execute('''
+        SELECT species_catalog.record
+        FROM species_catalog_fts
+        JOIN species_catalog ON species_catalog.perenual_id = species_catalog_fts.rowid
+        WHERE species_catalog_fts MATCH ?
+        ORDER BY bm25(species_catalog_fts, 10.0, 5.0, 1.0)
+        LIMIT ?
+    ''', (match, limit)).fetchall()
+    return [format_search_result(json.loads(row['record'])) for row in rows]
+
+def get_catalog_details(conn, perenual_id):
+    """Details for a species from the catalog, if it was imported from a details dump"""
+    row = conn.execute('SELECT record FROM species_catalog WHERE perenual_id = ?', (perenual_id,)).fetchone()
+    if row is None:
+        return None
+    record = json.loads(row['record'])
+    # species-list records lack these; only full details records can answer
+    if 'description' not in record and 'hardiness' not in record:
+        return None
+    return format_species_details(record)
+
+def get_cached_search(conn, query_key):
+    """Cached results for a normalized query as (results, is_fresh), or None"""
+    row = conn.execute(
+        'SELECT results, fetched_at, last_used FROM perenual_search_cache WHERE query_key = ?', (query_key,)
+    ).fetchone()
+    if row is None:
+        return None
+    now = time.time()
+    if now - row['last_used'] > SEARCH_CACHE_TOUCH_SECONDS:
+        conn.execute('UPDATE perenual_search_cache SET last_used = ? WHERE query_key = ?', (now, query_key))
+        conn.commit()
+    is_fresh = now - row['fetched_at'] < app.config['PERENUAL_SEARCH_CACHE_TTL']
+    return json.loads(row['results']), is_fresh
+
+def store_search(conn, query_key, results):
+    """Cache results for a query, evicting the least recently used entries past the size bound"""
+    now = time.time()
+    conn.execute('''
+        INSERT INTO perenual_search_cache (query_key, results, fetched_at, last_used)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(query_key) DO UPDATE SET
+            results = excluded.results, fetched_at = excluded.fetched_at, last_used = excluded.last_used
+    ''', (query_key, json.dumps(results), now, now))
+    excess = conn.execute('SELECT COUNT(*) FROM perenual_search_cache').fetchone()[0] - app.config['PERENUAL_SEARCH_CACHE_SIZE']
+    if excess > 0:
+        conn.execute('''
+            DELETE FROM perenual_search_cache WHERE query_key IN (
+                SELECT query_key FROM perenual_search_cache ORDER BY last_used LIMIT ?
+            )
+        ''', (excess,))
+        perenual_metrics.incr('search_cache_evictions', excess)
+    conn.commit()
+
+# Prefetched details, keyed by perenual_id, as (expires_at, details)
+prefetched_details = LRUCache(1000)
+prefetch_pool = ThreadPoolExecutor(
+    max_workers=max(app.config['PERENUAL_PREFETCH_WORKERS'], 1), thread_name_prefix='details-prefetch'
+)
+_prefetching = set()
+_prefetching_lock = threading.Lock()
+
+def prefetch_details(conn, results):
+    """Start fetching details for the top search results the user is likely to pick next"""
+    limit = app.config['PERENUAL_PREFETCH_DETAILS']
+    if not limit or not app.config['PERENUAL_API_KEY'] or get_budget(conn)['cache_only']:
+        return
+    for result in results[:limit]:
+        perenual_id = result.get('id')
+        if perenual_id is None or peek_prefetched(perenual_id) is not None:
+            continue
+        if get_cached_details(conn, perenual_id) is not None or get_catalog_details(conn, perenual_id) is not None:
+            continue
+        with _prefetching_lock:
+            if perenual_id in _prefetching:
+                continue
+            _prefetching.add(perenual_id)
+        prefetch_pool.submit(prefetch_one, perenual_id)
+
+def prefetch_one(perenual_id):
+    """Fetch one species' details into the prefetch store (runs on the prefetch pool)"""
+    try:
+        details = fetch_species_details(perenual_id)
+        prefetched_details.set(perenual_id, (time.monotonic() + app.config['PERENUAL_PREFETCH_TTL'], details))
+        perenual_metrics.incr('prefetch_fetched')
+    except requests.RequestException:
+        # Only speculative; the real lookup will try again if the species gets picked
+        perenual_metrics.incr('prefetch_failures')
+    finally:
+        with _prefetching_lock:
+            _prefetching.discard(perenual_id)
+
+def peek_prefetched(perenual_id):
+    """Unexpired prefetched details for a species, or None"""
+    entry = prefetched_details.get(perenual_id)
+    if entry is None:
+        return None
+    expires_at, details = entry
+    if time.monotonic() >= expires_at:
+        prefetched_details.pop(perenual_id)
+        return None
+    return details
+
+def take_prefetched(conn, perenual_id):
+    """Prefetched details for a species, moved into the details cache now that someone wants them"""
+    details = peek_prefetched(perenual_id)
+    if details is None:
+        return None
+    prefetched_details.pop(perenual_id)
+    store_details(conn, perenual_id, details)
+    perenual_metrics.incr('prefetch_hits')
+    return details
 
 @app.route('/api/plants/search', methods=['GET'])
 def search_plants():
     """Search for plants using Perenual API"""
     query = request.args.get('q', '')
-    if not query:
+    query_key = normalize_query(query)
+    if not query_key:
         return jsonify({'error': 'Query parameter required'}), 400
 
+    conn = get_db()
+    mode = app.config['PERENUAL_SEARCH_MODE']
+    if mode in ('catalog', 'auto'):
+        results = search_catalog(conn, query_key)
+        if results or mode == 'catalog':
+            perenual_metrics.incr('catalog_search_hits' if results else 'catalog_search_misses')
+            if mode == 'auto':
+                prefetch_details(conn, results)
+            return jsonify({'results': results, 'source': 'catalog'})
+        perenual_metrics.incr('catalog_search_misses')
+
+    cached = get_cached_search(conn, query_key)
+    if cached is not None and cached[1]:
+        perenual_metrics.incr('search_cache_hits')
+        prefetch_details(conn, cached[0])
+        return jsonify({'results': cached[0], 'source': 'cache'})
+    perenual_metrics.incr('search_cache_misses')
+
     api_key = app.config['PERENUAL_API_KEY']
     if not api_key:
         return jsonify({'error': 'API key not configured'}), 500
 
     try:
-        response = requests.get(
-            f'https://perenual.com/api/species-list',
-            params={'key': api_key, 'q': query},
-            timeout=10
-        )
-        response.raise_for_status()
-        data = response.json()
-
-        # Format results for easier frontend consumption
-        results = []
-        for plant in data.get('data', [])[:10]:  # Limit to 10 results
-            results.append({
-                'id': plant.get('id'),
-                'common_name': plant.get('common_name'),
-                'scientific_name': plant.get('scientific_name', [''])[0] if plant.get('scientific_name') else '',
-                'sunlight': ', '.join(plant.get('sunlight', [])) if plant.get('sunlight') else None,
-                'watering': plant.get('watering'),
-                'cycle': plant.get('cycle'),
-                'image': plant.get('default_image', {}).get('thumbnail') if plant.get('default_image') else None
-            })
-
-        return jsonify({'results': results})
+        results = fetch_species_search(query_key)
     except requests.RequestException as e:
-        return jsonify({'error': f'Failed to fetch plant data: {str(e)}'}), 500
+        if cached is not None:
+            # Better an old answer for the same query than none at all
+            perenual_metrics.incr('search_stale_fallbacks')
+            return jsonify({'results': cached[0], 'source': 'cache', 'stale': True})
+        app.logger.warning('Perenual search for %r failed: %s', query_key, e)
+        return jsonify({'error': f'Failed to fetch plant data: {upstream_error(e)}'}), 500
+
+    store_search(conn, query_key, results)
+    prefetch_details(conn, results)
+    return jsonify({'results': results, 'source': 'perenual'})
+
+def format_species_details(data):
+    """Pick the metadata we store on a plant out of a Perenual species record"""
+    return {
+        'perenual_id': data.get('id'),
+        'scientific_name': data.get('scientific_name', [''])[0] if data.get('scientific_name') else '',
+        'sunlight': ', '.join(data.get('sunlight', [])) if data.get('sunlight') else None,
+        'watering_needs': data.get('watering'),
+        'cycle': data.get('cycle'),
+        'hardiness_zones': data.get('hardiness', {}).get('min') if data.get('hardiness') else None,
+        'description': data.get('description')
+    }
+
+def fetch_species_details(perenual_id):
+    """Fetch and format one species' details from Perenual"""
+    return species_details_flight.do(
+        perenual_id, lambda: format_species_details(perenual_get(f'species/details/{perenual_id}'))
+    )
+
+def get_cached_details(conn, perenual_id):
+    """Cached details as (details, is_fresh), or None"""
+    row = conn.execute(
+        'SELECT details, fetched_at FROM perenual_details_cache WHERE perenual_id = ?', (perenual_id,)
+    ).fetchone()
+    if row is None:
+        return None
+    is_fresh = time.time() - row['fetched_at'] < app.config['PERENUAL_DETAILS_FRESH_SECONDS']
+    return json.loads(row['details']), is_fresh
+
+def store_details(conn, perenual_id, details):
+    """Cache one species' details"""
+    conn.execute('''
+        INSERT INTO perenual_details_cache (perenual_id, details, fetched_at) VALUES (?, ?, ?)
+        ON CONFLICT(perenual_id) DO UPDATE SET details = excluded.details, fetched_at = excluded.fetched_at
+    ''', (perenual_id, json.dumps(details), time.time()))
+    conn.commit()
+
+_details_refreshing = set()
+_details_refreshing_lock = threading.Lock()
+
+def refresh_details_in_background(perenual_id):
+    """Re-fetch stale details on the prefetch pool, at most one refresh per species at a time"""
+    with _details_refreshing_lock:
+        if perenual_id in _details_refreshing:
+            return
+        _details_refreshing.add(perenual_id)
+
+    def refresh():
+        try:
+            details = fetch_species_details(perenual_id)
+            with app.app_context():
+                store_details(get_db(), perenual_id, details)
+            perenual_metrics.incr('details_refreshes')
+        except requests.RequestException:
+            # The stale copy keeps being served; the next request tries again
+            perenual_metrics.incr('details_refresh_failures')
+        finally:
+            with _details_refreshing_lock:
+                _details_refreshing.discard(perenual_id)
+
+    # Shares the prefetch threads, so a page of stale hits queues up instead of fanning out
+    prefetch_pool.submit(refresh)
+
+def require_admin():
+    """An error response unless the request carries the configured admin token"""
+    token = app.config['ADMIN_TOKEN']
+    if not token:
+        return jsonify({'error': 'Admin endpoints are disabled (ADMIN_TOKEN not set)'}), 403
+    if request.headers.get('X-Admin-Token') != token:
+        return jsonify({'error': 'Invalid admin token'}), 403
+    return None
 
 @app.route('/api/plants/details/<int:perenual_id>', methods=['GET'])
 def get_plant_details(perenual_id):
     """Get detailed plant information from Perenual API"""
+    conn = get_db()
+    cached = get_cached_details(conn, perenual_id)
+    if cached is not None:
+        details, is_fresh = cached
+        if is_fresh:
+            perenual_metrics.incr('details_cache_hits')
+        else:
+            perenual_metrics.incr('details_cache_stale_hits')
+            if app.config['PERENUAL_API_KEY'] and not get_budget(conn)['cache_only']:
+                refresh_details_in_background(perenual_id)
+        return jsonify(details)
+    perenual_metrics.incr('details_cache_misses')
+
+    if app.config['PERENUAL_SEARCH_MODE'] in ('catalog', 'auto'):
+        details = get_catalog_details(conn, perenual_id)
+        if details is not None:
+            perenual_metrics.incr('catalog_details_hits')
+            return jsonify(details)
+
+    details = take_prefetched(conn, perenual_id)
+    if details is not None:
+        return jsonify(details)
+
     api_key = app.config['PERENUAL_API_KEY']
     if not api_key:
         return jsonify({'error': 'API key not configured'}), 500
 
     try:
-        response = requests.get(
-            f'https://perenual.com/api/species/details/{perenual_id}',
-            params={'key': api_key},
-            timeout=10
-        )
-        response.raise_for_status()
-        data = response.json()
-
-        # Extract relevant metadata
-        details = {
-            'perenual_id': data.get('id'),
-            'scientific_name': data.get('scientific_name', [''])[0] if data.get('scientific_name') else '',
-            'sunlight': ', '.join(data.get('sunlight', [])) if data.get('sunlight') else None,
-            'watering_needs': data.get('watering'),
-            'cycle': data.get('cycle'),
-            'hardiness_zones': data.get('hardiness', {}).get('min') if data.get('hardiness') else None,
-            'description': data.get('description')
-        }
+        details = fetch_species_details(perenual_id)
+    except requests.RequestException as e:
+        app.logger.warning('Perenual details for %s failed: %s', perenual_id, e)
+        return jsonify({'error': f'Failed to fetch plant details: {upstream_error(e)}'}), 500
+
+    store_details(conn, perenual_id, details)
+    return jsonify(details)
+
+@app.route('/api/admin/perenual/details/<int:perenual_id>', methods=['DELETE'])
+def invalidate_plant_details(perenual_id):
+    """Drop one species from the details cache"""
+    denied = require_admin()
+    if denied:
+        return denied
+    conn = get_db()
+    removed = conn.execute('DELETE FROM perenual_details_cache WHERE perenual_id = ?', (perenual_id,)).rowcount
+    conn.commit()
+    return jsonify({'success': True, 'removed': removed})
+
+@app.route('/api/admin/perenual/details', methods=['DELETE'])
+def invalidate_all_plant_details():
+    """Empty the details cache"""
+    denied = require_admin()
+    if denied:
+        return denied
+    conn = get_db()
+    removed = conn.execute('DELETE FROM perenual_details_cache').rowcount
+    conn.commit()
+    return jsonify({'success': True, 'removed': removed})
 
-        return jsonify(details)
+@app.route('/api/perenual/status', methods=['GET'])
+def perenual_status():
+    """Cache statistics for the Perenual integration"""
+    conn = get_db()
+    entries = conn.execute('SELECT COUNT(*) FROM perenual_search_cache').fetchone()[0]
+    details_entries = conn.execute('SELECT COUNT(*) FROM perenual_details_cache').fetchone()[0]
+    catalog_entries = conn.execute('SELECT COUNT(*) FROM species_catalog').fetchone()[0]
+    job_counts = dict(conn.execute('SELECT status, COUNT(*) FROM enrichment_jobs GROUP BY status').fetchall())
+    return jsonify({
+        'search_mode': app.config['PERENUAL_SEARCH_MODE'],
+        'budget': dict(
+            get_budget(conn),
+            reserve=app.config['PERENUAL_BUDGET_RESERVE'],
+            rejections=perenual_metrics.get('budget_rejections'),
+        ),
+        'rate_limit': {
+            'per_second': app.config['PERENUAL_RATE_PER_SECOND'],
+            'burst': app.config['PERENUAL_RATE_BURST'],
+            'rejections': perenual_metrics.get('rate_limited'),
+        },
+        'circuit_breaker': dict(
+            perenual_breaker.snapshot(),
+            rejections=perenual_metrics.get('breaker_rejections'),
+            stale_fallbacks=perenual_metrics.get('search_stale_fallbacks'),
+        ),
+        'coalescing': {
+            'search_upstream_calls': perenual_metrics.get('search_upstream_calls'),
+            'search_coalesced': perenual_metrics.get('search_coalesced'),
+            'details_upstream_calls': perenual_metrics.get('details_upstream_calls'),
+            'details_coalesced': perenual_metrics.get('details_coalesced'),
+        },
+        'prefetch': {
+            'top_results': app.config['PERENUAL_PREFETCH_DETAILS'],
+            'held': len(prefetched_details),
+            'fetched': perenual_metrics.get('prefetch_fetched'),
+            'hits': perenual_metrics.get('prefetch_hits'),
+            'failures': perenual_metrics.get('prefetch_failures'),
+        },
+        'enrichment': {
+            'workers': len(_enrichment_workers),
+            'gardens_waiting': len(_enrichment_gardens),
+            'pending': job_counts.get('pending', 0),
+            'failed': job_counts.get('failed', 0),
+            'completed': perenual_metrics.get('enrichment_completed'),
+            'retries': perenual_metrics.get('enrichment_retries'),
+        },
+        'catalog': {
+            'species': catalog_entries,
+            'search_hits': perenual_metrics.get('catalog_search_hits'),
+            'search_misses': perenual_metrics.get('catalog_search_misses'),
+            'details_hits': perenual_metrics.get('catalog_details_hits'),
+        },
+        'search_cache': {
+            'entries': entries,
+            'max_entries': app.config['PERENUAL_SEARCH_CACHE_SIZE'],
+            'ttl_seconds': app.config['PERENUAL_SEARCH_CACHE_TTL'],
+            'hits': perenual_metrics.get('search_cache_hits'),
+            'misses': perenual_metrics.get('search_cache_misses'),
+            'evictions': perenual_metrics.get('search_cache_evictions'),
+        },
+        'details_cache': {
+            'entries': details_entries,
+            'fresh_seconds': app.config['PERENUAL_DETAILS_FRESH_SECONDS'],
+            'hits': perenual_metrics.get('details_cache_hits'),
+            'stale_hits': perenual_metrics.get('details_cache_stale_hits'),
+            'misses': perenual_metrics.get('details_cache_misses'),
+            'refreshes': perenual_metrics.get('details_refreshes'),
+            'refresh_failures': perenual_metrics.get('details_refresh_failures'),
+        },
+    })
+
+WEATHER_CURRENT_FIELDS = 'temperature_2m,relative_humidity_2m,apparent_temperature,precipitation,weather_code,wind_speed_10m'
+
+weather_cache = LRUCache(256)
+weather_flight = SingleFlight('weather')
+
+def weather_cell(latitude, longitude):
+    """Snap coordinates to the weather grid so nearby gardens share one cache entry"""
+    grid = app.config['WEATHER_GRID_DEGREES']
+    return round(round(latitude / grid) * grid, 4), round(round(longitude / grid) * grid, 4)
+
+def fetch_weather(cell):
+    """Fetch current conditions for a grid cell from Open-Meteo and cache them with an ETag and fetch time"""
+    latitude, longitude = cell
+    response = http_session.get(f"{app.config['WEATHER_BASE_URL']}/forecast", params={
+        'latitude': latitude,
+        'longitude': longitude,
+        'current': WEATHER_CURRENT_FIELDS,
+        'daily': 'precipitation_sum',
+        'past_days': app.config['WEATHER_HISTORY_DAYS'],
+        'forecast_days': app.config['WEATHER_FORECAST_DAYS'],
+        'temperature_unit': 'fahrenheit',
+        'wind_speed_unit': 'mph',
+        'precipitation_unit': 'inch',
+        'timezone': app.config['WEATHER_TIMEZONE'],
+    }, timeout=(app.config['HTTP_CONNECT_TIMEOUT'], app.config['HTTP_READ_TIMEOUT']))
+    response.raise_for_status()
+    data = response.json()
+    daily = data.get('daily') or {}
+    payload = {
+        'latitude': latitude,
+        'longitude': longitude,
+        'current': data.get('current'),
+        'daily_precipitation': dict(zip(daily.get('time', []), daily.get('precipitation_sum', []))),
+    }
+    # Only the forecast goes into the ETag, so a refresh that brings back the
+    # same weather keeps answering 304s
+    digest = hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()[:16]
+    entry = (payload, f'weather-{digest}', time.time())
+    weather_cache.set(cell, entry)
+    return entry
+
+def get_weather(cell):
+    """(payload, etag, fetched at) for a grid cell, going upstream at most once per refresh interval"""
+    entry = weather_cache.get(cell)
+    if entry is not None and time.time() - entry[2] < app.config['WEATHER_REFRESH_SECONDS']:
+        perenual_metrics.incr('weather_cache_hits')
+        return entry
+    try:
+        return weather_flight.do(cell, lambda: fetch_weather(cell))
+    except requests.RequestException:
+        if entry is None:
+            raise
+        # Old weather beats no weather
+        return entry
+
+_weather_refreshing = set()
+_weather_refreshing_lock = threading.Lock()
+
+def refresh_weather_in_background(cell):
+    """Fetch weather for a cell on a background thread, at most one refresh per cell at a time"""
+    with _weather_refreshing_lock:
+        if cell in _weather_refreshing:
+            return
+        _weather_refreshing.add(cell)
+
+    def refresh():
+        try:
+            get_weather(cell)
+        except requests.RequestException:
+            # Schedules go on using the weather we have, or none
+            pass
+        finally:
+            with _weather_refreshing_lock:
+                _weather_refreshing.discard(cell)
+
+    threading.Thread(target=refresh, name=f'weather-refresh-{cell}', daemon=True).start()
+
+def garden_location(conn):
+    """(latitude, longitude, name) of the current garden: its own from app_meta, else the configured one"""
+    meta = {row['key']: row['value'] for row in conn.execute(
+        "SELECT key, value FROM app_meta WHERE key IN ('latitude', 'longitude')"
+    )}
+    if len(meta) == 2:
+        return meta['latitude'], meta['longitude'], None
+    return app.config['WEATHER_LATITUDE'], app.config['WEATHER_LONGITUDE'], app.config['WEATHER_LOCATION_NAME']
+
+def garden_rain(conn):
+    """(rain days, rain tag) for the garden from cached weather, never waiting on Open-Meteo.
+
+    Rain days are sorted (day ordinal, inches) pairs at or above
+    WEATHER_RAIN_CREDIT_INCHES, history and forecast alike. The tag changes
+    only when they do, not with every temperature reading. Missing or
+    expired weather is refreshed in the background for the next request.
+    """
+    threshold = app.config['WEATHER_RAIN_CREDIT_INCHES']
+    if not threshold:
+        return (), None
+    cell = weather_cell(*garden_location(conn)[:2])
+    entry = weather_cache.get(cell)
+    if entry is None or time.time() - entry[2] >= app.config['WEATHER_REFRESH_SECONDS']:
+        refresh_weather_in_background(cell)
+    if entry is None:
+        return (), None
+    payload = entry[0]
+    rain_days = tuple(sorted(
+        (date.fromisoformat(day).toordinal(), inches)
+        for day, inches in payload.get('daily_precipitation', {}).items()
+        if inches is not None and inches >= threshold
+    ))
+    return rain_days, 'rain-' + hashlib.sha256(repr(rain_days).encode()).hexdigest()[:12]
+
+@garden_routes.route('/api/weather', methods=['GET'])
+def get_weather_report():
+    """Current weather at the garden, shared by every dashboard"""
+    # Only the garden's own location: arbitrary coordinates would spend upstream
+    # calls and push garden cells out of the weather cache
+    latitude, longitude, name = garden_location(get_db())
+    try:
+        payload, etag, fetched_at = get_weather(weather_cell(latitude, longitude))
     except requests.RequestException as e:
-        return jsonify({'error': f'Failed to fetch plant details: {str(e)}'}), 500
+        return jsonify({'error': f'Failed to fetch weather: {type(e).__name__}'}), 500
+
+    cached = not_modified(etag)
+    if cached is not None:
+        return add_validators(cached, etag)
+    response = jsonify(dict(payload, location=name))
+    # When the server last asked Open-Meteo, kept out of the ETag
+    response.last_modified = datetime.fromtimestamp(int(fetched_at), timezone.utc)
+    return add_validators(response, etag)
+
+@garden_routes.route('/api/location', methods=['GET'])
+def get_location():
+    """Where the garden is, for its weather and rain credit"""
+    latitude, longitude, name = garden_location(get_db())
+    return jsonify({'latitude': latitude, 'longitude': longitude, 'name': name})
+
+@garden_routes.route('/api/location', methods=['PUT'])
+def set_location():
+    """Set the garden's own location, overriding WEATHER_LATITUDE/WEATHER_LONGITUDE"""
+    data = request.json or {}
+    try:
+        latitude, longitude = float(data['latitude']), float(data['longitude'])
+    except (KeyError, TypeError, ValueError):
+        return jsonify({'error': 'latitude and longitude are required numbers'}), 400
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        return jsonify({'error': 'latitude must be within ±90 and longitude within ±180'}), 400
+    conn = get_db()
+    conn.executemany('''
+        INSERT INTO app_meta (key, value) VALUES (?, ?)
+        ON CONFLICT(key) DO UPDATE SET value = excluded.value
+    ''', [('latitude', latitude), ('longitude', longitude)])
+    conn.commit()
+    return jsonify({'latitude': latitude, 'longitude': longitude, 'name': None})
+
+METADATA_FIELDS = ('scientific_name', 'sunlight', 'watering_needs', 'cycle', 'hardiness_zones', 'description')
+
+# How long a claimed job is hidden from other workers; a worker that dies
+# mid-job leaves it to be picked up again once this runs out
+ENRICHMENT_LEASE_SECONDS = 300
+# Longest an idle worker sleeps before checking the table again
+ENRICHMENT_POLL_SECONDS = 30
+
+enrichment_wakeup = threading.Event()
+_enrichment_workers = []
+# Gardens that may have pending jobs, with a count of notifications so a
+# worker never drops a garden that was notified while it was checking it
+_enrichment_gardens = {}
+_enrichment_gardens_lock = threading.Lock()
+
+def notify_enrichment(garden_id):
+    """Tell the workers a garden has a job waiting"""
+    with _enrichment_gardens_lock:
+        _enrichment_gardens[garden_id] = _enrichment_gardens.get(garden_id, 0) + 1
+    enrichment_wakeup.set()
+
+def needs_enrichment(data):
+    """Whether a plant payload names a Perenual species but carries none of its metadata"""
+    return bool(data.get('perenual_id')) and not any(data.get(field) for field in METADATA_FIELDS)
+
+def enqueue_enrichment(conn, plant_id, perenual_id):
+    """Queue a metadata lookup for a plant, replacing any job it already had"""
+    conn.execute('''
+        INSERT INTO enrichment_jobs (plant_id, perenual_id, status, attempts, next_attempt_at, last_error)
+        VALUES (?, ?, 'pending', 0, ?, NULL)
+        ON CONFLICT(plant_id) DO UPDATE SET
+            perenual_id = excluded.perenual_id, status = 'pending', attempts = 0,
+            next_attempt_at = excluded.next_attempt_at, last_error = NULL
+    ''', (plant_id, perenual_id, time.time()))
+
+def claim_enrichment_job(conn):
+    """Lease the next due job to this worker, or None if nothing is due"""
+    now = time.time()
+    job = conn.execute('''
+        UPDATE enrichment_jobs SET next_attempt_at = ?
+        WHERE plant_id = (
+            SELECT plant_id FROM enrichment_jobs
+            WHERE status = 'pending' AND next_attempt_at <= ?
+            ORDER BY next_attempt_at LIMIT 1
+        )
+        RETURNING plant_id, perenual_id, attempts
+    ''', (now + ENRICHMENT_LEASE_SECONDS, now)).fetchone()
+    conn.commit()
+    return job
+
+def resolve_species_details(perenual_id):
+    """Details for a species from the caches or catalog, going to Perenual only if neither has it"""
+    conn = get_shared_db()
+    cached = get_cached_details(conn, perenual_id)
+    if cached is not None:
+        return cached[0]
+    details = get_catalog_details(conn, perenual_id) or take_prefetched(conn, perenual_id)
+    if details is not None:
+        return details
+    if not app.config['PERENUAL_API_KEY']:
+        raise PerenualUnavailable('API key not configured')
+    details = fetch_species_details(perenual_id)
+    store_details(conn, perenual_id, details)
+    return details
+
+def apply_enrichment(conn, plant_id, perenual_id, details):
+    """Write looked-up metadata onto a plant and announce the change"""
+    plant = get_plant_bed(conn, plant_id)
+    with plant_write():
+        # Skip plants deleted or pointed at another species while the lookup ran
+        updated = conn.execute('''
+            UPDATE plants
+            SET scientific_name = ?, sunlight = ?, watering_needs = ?, cycle = ?, hardiness_zones = ?, description = ?
+            WHERE id = ? AND perenual_id = ?
+        ''', tuple(details.get(field) for field in METADATA_FIELDS) + (plant_id, perenual_id)).rowcount
+        conn.execute('DELETE FROM enrichment_jobs WHERE plant_id = ? AND perenual_id = ?', (plant_id, perenual_id))
+        if not updated:
+            conn.commit()
+            return
+        revision = record_plant_write(conn, plant['bed_id'])
+        commit_and_publish(conn, 'enriched', revision, plant_id, plant['bed_id'])
+    perenual_metrics.incr('enrichment_completed')
+
+def retry_enrichment(conn, job, error, count_attempt=True):
+    """Push a failed job back with exponential backoff, or give up after too many attempts"""
+    conn.rollback()
+    attempts = job['attempts'] + (1 if count_attempt else 0)
+    if attempts >= app.config['ENRICHMENT_MAX_ATTEMPTS']:
+        status, next_attempt_at = 'failed', time.time()
+        perenual_metrics.incr('enrichment_failed')
+    else:
+        delay = app.config['ENRICHMENT_RETRY_SECONDS'] * 2 ** max(attempts - 1, 0)
+        status, next_attempt_at = 'pending', time.time() + random.uniform(0.5, 1) * delay
+        perenual_metrics.incr('enrichment_retries')
+    conn.execute('''
+        UPDATE enrichment_jobs SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ?
+        WHERE plant_id = ? AND perenual_id = ?
+    ''', (status, attempts, next_attempt_at, str(error), job['plant_id'], job['perenual_id']))
+    conn.commit()
+
+def run_enrichment_job(conn, job):
+    """Look up and apply one claimed job, scheduling a retry if it fails"""
+    try:
+        details = resolve_species_details(job['perenual_id'])
+        apply_enrichment(conn, job['plant_id'], job['perenual_id'], details)
+    except PerenualUnavailable as e:
+        # Open circuit, spent budget or no key: wait it out without using up attempts
+        retry_enrichment(conn, job, e, count_attempt=False)
+    except requests.HTTPError as e:
+        retry_enrichment(conn, job, f'HTTP {e.response.status_code}')
+    except Exception as e:
+        retry_enrichment(conn, job, type(e).__name__)
+
+def enrichment_worker():
+    """Work through due jobs a garden at a time, sleeping until the next one is due or new work arrives"""
+    while True:
+        with _enrichment_gardens_lock:
+            gardens = dict(_enrichment_gardens)
+        worked, next_at = False, None
+        for garden_id, notified in gardens.items():
+            try:
+                with garden_context(garden_id):
+                    conn = get_db()
+                    job = claim_enrichment_job(conn)
+                    if job is not None:
+                        run_enrichment_job(conn, job)
+                        worked = True
+                        continue
+                    due = conn.execute(
+                        "SELECT MIN(next_attempt_at) FROM enrichment_jobs WHERE status = 'pending'"
+                    ).fetchone()[0]
+            except sqlite3.Error:
+                # A locked or broken shard mustn't take the worker down; any
+                # claimed job comes back once its lease runs out
+                app.logger.exception('Enrichment failed in garden %s', garden_id)
+                continue
+            if due is not None:
+                next_at = due if next_at is None else min(next_at, due)
+                continue
+            with _enrichment_gardens_lock:
+                if _enrichment_gardens.get(garden_id) == notified:
+                    del _enrichment_gardens[garden_id]
+        if worked:
+            continue
+        timeout = ENRICHMENT_POLL_SECONDS if next_at is None else next_at - time.time()
+        enrichment_wakeup.wait(min(max(timeout, 0), ENRICHMENT_POLL_SECONDS))
+        enrichment_wakeup.clear()
+
+def prepare_gardens():
+    """Bring every garden's stored icons up to date and queue the jobs a previous run left pending"""
+    for garden_id in list_gardens():
+        try:
+            with garden_context(garden_id):
+                conn = get_db()
+                sync_plant_icons(conn)
+                if conn.execute("SELECT 1 FROM enrichment_jobs WHERE status = 'pending' LIMIT 1").fetchone():
+                    notify_enrichment(garden_id)
+        except sqlite3.Error:
+            app.logger.exception('Could not prepare garden %s', garden_id)
+
+def start_enrichment_workers():
+    """Start the enrichment worker threads"""
+    while len(_enrichment_workers) < app.config['ENRICHMENT_WORKERS']:
+        worker = threading.Thread(
+            target=enrichment_worker, name=f'enrichment-{len(_enrichment_workers)}', daemon=True
+        )
+        worker.start()
+        _enrichment_workers.append(worker)
+
+_started = False
+_startup_lock = threading.Lock()
+
+def start_app():
+    """Create the schema, prepare every garden and start the enrichment workers, once per process"""
+    global _started
+    with _startup_lock:
+        if _started:
+            return
+        with app.app_context():
+            init_db()
+        prepare_gardens()
+        start_enrichment_workers()
+        _started = True
+
+@app.before_request
+def ensure_started():
+    """Run startup on the first request, so WSGI servers that only import app:app get it too"""
+    if not _started:
+        start_app()
+
+app.register_blueprint(garden_routes)
+app.register_blueprint(garden_routes, url_prefix='/gardens/<garden_id>', name='hosted_garden')
 
 if __name__ == '__main__':
-    init_db()
+    start_app()
     # Use 0.0.0.0 to allow external access (important for containers)
     app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 5000)), debug=False)
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Benchmark: pooled, tuned SQLite connections vs connect-per-request
+
+Measures requests/sec for index() and water_plant() through the Flask test
+client, once with DB_POOL_SIZE=0 (a fresh untuned sqlite3.connect() per
+request, the old behaviour) and once with the connection pool.
+
+Usage: python benchmarks/bench_db.py [--plants 200] [--duration 3]
+"""
+
+import argparse
+import os
+import tempfile
+
+from common import garden_app, make_database, measure
+
+
+def run(mode, pool_size, plants, duration, tmpdir):
+    app = garden_app.app
+    app.config['DB_POOL_SIZE'] = pool_size
+    make_database(os.path.join(tmpdir, f'{mode}.db'), plants)
+    client = app.test_client()
+
+    def index():
+        assert client.get('/').status_code == 200
+
+    def water():
+        assert client.post('/api/plants/1/water').status_code == 200
+
+    return {
+        'index': measure(index, duration),
+        'water_plant': measure(water, duration),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--plants', type=int, default=200)
+    parser.add_argument('--duration', type=float, default=3.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        legacy = run('connect-per-request', 0, args.plants, args.duration, tmpdir)
+        pooled = run('pooled', 8, args.plants, args.duration, tmpdir)
+
+    print(f"{'route':<14}{'per-request':>14}{'pooled':>14}{'speedup':>10}")
+    for route in ('index', 'water_plant'):
+        print(f"{route:<14}{legacy[route]:>12.0f}/s{pooled[route]:>12.0f}/s"
+              f"{pooled[route] / legacy[route]:>9.2f}x")
+
+
+if __name__ == '__main__':
+    main()
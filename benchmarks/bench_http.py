@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark: shared pooled HTTP session vs a bare requests.get() per call
+
+Starts the bundled Perenual stub (perenual_stub.py) and times the same
+lookup made with a fresh requests.get() (new TCP connection every call,
+the old behaviour) and through the app's pooled perenual_get().
+
+The stub speaks plain HTTP, so the saving shown is only the TCP setup and
+per-call session construction; against perenual.com each reused connection
+also skips a TLS handshake.
+
+Usage: python benchmarks/bench_http.py [--calls 500]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import requests
+
+from common import garden_app, make_database
+import perenual_stub
+
+
+def time_calls(fn, calls):
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--calls', type=int, default=500)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.TemporaryDirectory()
+    # perenual_get records each call against the daily budget in the database
+    make_database(os.path.join(tmpdir.name, 'http.db'))
+    server, base_url = perenual_stub.start_in_thread()
+
+    app = garden_app.app
+    app.config['PERENUAL_BASE_URL'] = base_url
+    app.config['PERENUAL_API_KEY'] = 'bench'
+    # Measure the transport, not the client-side quota guards
+    app.config['PERENUAL_DAILY_BUDGET'] = 0
+    garden_app.perenual_bucket.rate = garden_app.perenual_bucket.capacity = 1e9
+
+    def bare():
+        response = requests.get(f'{base_url}/species-list', params={'key': 'bench', 'q': 'tomato'}, timeout=10)
+        response.raise_for_status()
+        response.json()
+
+    def pooled():
+        with app.app_context():
+            garden_app.perenual_get('species-list', q='tomato')
+
+    results = {
+        'requests.get': time_calls(bare, args.calls),
+        'pooled session': time_calls(pooled, args.calls),
+    }
+    server.shutdown()
+    tmpdir.cleanup()
+
+    print(f"{'client':<16}{'mean ms':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, samples in results.items():
+        samples.sort()
+        print(f'{name:<16}{statistics.mean(samples):>10.3f}{samples[len(samples) // 2]:>10.3f}'
+              f'{samples[int(len(samples) * 0.99) - 1]:>10.3f}')
+    saved = statistics.mean(results['requests.get']) - statistics.mean(results['pooled session'])
+    print(f'saved per call: {saved:.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark: batch watering schedule, NumPy vs the plain-Python fallback
+
+Times watering_schedule.schedule_many() over synthetic gardens from 1k to
+1M plants with a week of rain history and forecast. The input is the
+columns index() reads from SQLite. The work timed is rain credit, days
+since watering, status buckets and text, and the urgency sort.
+
+Usage: python benchmarks/bench_schedule.py [--sizes 1000,10000,100000,1000000] [--repeat 3]
+"""
+
+import argparse
+import random
+import time
+from datetime import date
+
+import common  # noqa: F401  (puts the repository root on sys.path)
+import watering_schedule
+
+
+def make_garden(size, today_day, seed=1):
+    rng = random.Random(seed)
+    ids = list(range(1, size + 1))
+    intervals = [rng.choice((1, 2, 3, 7, 14)) for _ in ids]
+    last_days = [None if rng.random() < 0.02 else today_day - rng.randint(0, 30) for _ in ids]
+    rain_days = ((today_day - 5, 0.7), (today_day - 2, 1.1), (today_day + 1, 0.6))
+    return ids, intervals, last_days, rain_days
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', default='1000,10000,100000,1000000')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    if watering_schedule.np is None:
+        parser.error('NumPy is not installed; pip install numpy to compare')
+
+    today_day = date.today().toordinal()
+    print(f"{'plants':>10}{'python ms':>12}{'numpy ms':>12}{'speedup':>10}")
+    for size in (int(s) for s in args.sizes.split(',')):
+        ids, intervals, last_days, rain_days = make_garden(size, today_day)
+        python_ms = best_of(
+            lambda: watering_schedule.schedule_many(ids, intervals, last_days, today_day, rain_days, use_numpy=False),
+            args.repeat,
+        )
+        numpy_ms = best_of(
+            lambda: watering_schedule.schedule_many(ids, intervals, last_days, today_day, rain_days, use_numpy=True),
+            args.repeat,
+        )
+        print(f'{size:>10}{python_ms:>12.1f}{numpy_ms:>12.1f}{python_ms / numpy_ms:>9.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Shared helpers for the Garden Tracker benchmarks.
+
+Benchmarks import the app from the repository root and build a throwaway
+database with the full migrated schema so they never touch real data.
+"""
+
+import contextlib
+import io
+import json
+import math
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import app as garden_app  # noqa: E402
+import migrate_db  # noqa: E402
+import migrate_plant_metadata  # noqa: E402
+
+PLANT_TYPES = ['Tomato', 'Pepper', 'Lettuce', 'Basil', 'Carrot', 'Rose', 'Sunflower', 'Squash']
+FREQUENCIES = ['Daily', 'Every 2 days', 'Every 3 days', 'Every week', 'Every 2 weeks', '']
+
+
+def make_database(path, plants=0, seed=1):
+    """Create a fully migrated database at path and seed it with plants"""
+    if os.path.exists(path):
+        os.remove(path)
+    app = garden_app.app
+    app.config['DATABASE'] = path
+    garden_app.fragment_cache.clear()
+    with app.app_context():
+        garden_app.init_db()
+    with contextlib.redirect_stdout(io.StringIO()):
+        migrate_db.migrate(path)
+        migrate_plant_metadata.migrate_db(path)
+    if plants:
+        seed_plants(plants, seed)
+
+
+def seed_plants(count, seed=1):
+    """Insert count random plants through the JSON API"""
+    rng = random.Random(seed)
+    client = garden_app.app.test_client()
+    today = date.today()
+    # Planting areas can't overlap, so each bed is cut into a grid of slots
+    side = math.ceil(math.sqrt(math.ceil(count / 9)))
+    cell = 100 / side
+    for i in range(count):
+        slot, bed = divmod(i, 9)
+        x, y = slot % side * cell, slot // side * cell
+        client.post('/api/plants', json={
+            'name': f'Plant {i}',
+            'type': rng.choice(PLANT_TYPES),
+            'planted_date': str(today - timedelta(days=rng.randint(0, 90))),
+            'watering_frequency': rng.choice(FREQUENCIES),
+            'bed_id': bed + 1,
+            'planting_area': json.dumps({'x': x, 'y': y, 'width': cell * 0.8, 'height': cell * 0.8}),
+        })
+
+
+def measure(fn, duration=2.0):
+    """Call fn repeatedly for roughly duration seconds and return calls/sec"""
+    calls = 0
+    start = time.perf_counter()
+    deadline = start + duration
+    while time.perf_counter() < deadline:
+        fn()
+        calls += 1
+    return calls / (time.perf_counter() - start)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Import a Perenual species dump into the offline species catalog
+
+Accepts a JSON file (a list of species, or a Perenual page object with a
+"data" list) or NDJSON (one species per line). Records from
+/api/species-list and /api/species/details/{id} can be mixed; a details
+record replaces a list record for the same id, never the other way round.
+
+Usage: python import_species.py species.ndjson [--replace]
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+
+from app import create_species_catalog
+from migrate_db import get_db_path
+
+BATCH_SIZE = 1000
+
+def read_records(path):
+    """Yield species records from a JSON or NDJSON dump"""
+    with open(path, encoding='utf-8') as f:
+        first = f.read(1)
+        while first.isspace():
+            first = f.read(1)
+        f.seek(0)
+        if first == '[' or first == '{':
+            try:
+                data = json.load(f)
+            except json.JSONDecodeError:
+                # A '{' start can also be NDJSON
+                f.seek(0)
+            else:
+                if isinstance(data, dict):
+                    data = data.get('data', [data])
+                yield from data
+                return
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if line:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f'{path}:{line_number}: {e}') from e
+
+def catalog_row(record):
+    """Columns for one species record, or None if it has no id"""
+    if not record.get('id'):
+        return None
+    scientific = record.get('scientific_name') or []
+    other = record.get('other_name') or []
+    return (
+        int(record['id']),
+        record.get('common_name') or '',
+        ' '.join(scientific) if isinstance(scientific, list) else str(scientific),
+        ' '.join(other) if isinstance(other, list) else str(other),
+        json.dumps(record),
+    )
+
+def import_species(path, replace=False):
+    db_path = get_db_path()
+    print(f"🌱 Importing species from {path} into {db_path}")
+
+    conn = sqlite3.connect(db_path)
+    create_species_catalog(conn)
+    if replace:
+        print("  ➜ Clearing existing catalog...")
+        conn.execute('DELETE FROM species_catalog')
+
+    # A details record (has description/hardiness) wins over a species-list record
+    upsert = '''
+        INSERT INTO species_catalog (perenual_id, common_name, scientific_name, other_names, record)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(perenual_id) DO UPDATE SET
+            common_name = excluded.common_name,
+            scientific_name = excluded.scientific_name,
+            other_names = excluded.other_names,
+            record = excluded.record
+        WHERE json_extract(excluded.record, '$.description') IS NOT NULL
+           OR json_extract(excluded.record, '$.hardiness') IS NOT NULL
+           OR (json_extract(species_catalog.record, '$.description') IS NULL
+               AND json_extract(species_catalog.record, '$.hardiness') IS NULL)
+    '''
+
+    imported = skipped = 0
+    batch = []
+    for record in read_records(path):
+        row = catalog_row(record) if isinstance(record, dict) else None
+        if row is None:
+            skipped += 1
+            continue
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            conn.executemany(upsert, batch)
+            imported += len(batch)
+            batch.clear()
+    if batch:
+        conn.executemany(upsert, batch)
+        imported += len(batch)
+
+    print("  ➜ Rebuilding full-text index...")
+    conn.execute("INSERT INTO species_catalog_fts(species_catalog_fts) VALUES ('rebuild')")
+    conn.commit()
+    total = conn.execute('SELECT COUNT(*) FROM species_catalog').fetchone()[0]
+    conn.close()
+
+    print(f"✅ Imported {imported} species ({skipped} skipped). Catalog now holds {total}.")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Import a Perenual species dump into the offline catalog')
+    parser.add_argument('path', help='JSON or NDJSON species dump')
+    parser.add_argument('--replace', action='store_true', help='drop the existing catalog first')
+    args = parser.parse_args()
+    try:
+        import_species(args.path, args.replace)
+    except (OSError, ValueError) as e:
+        print(f"❌ Import failed: {e}")
+        sys.exit(1)
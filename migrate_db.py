@@ -1,18 +1,26 @@
 #!/usr/bin/env python3
 """
 Database Migration Script for Garden Tracker
-Current Version: v2 (2024-01-19)
+Current Version: v8
 
 MIGRATION HISTORY:
 - v1: Initial schema (name, type, planted_date, location, watering_frequency, last_watered)
 - v2: Added bed_row, bed_col, planting_area columns for visual garden layout
+- v3: Plant metadata columns (applied by migrate_plant_metadata.py)
+- v4: Typed watering schedule columns (watering_interval_days, last_watered_day,
+      next_due_day) with an index on next_due_day
+- v5: Index on (bed_row, bed_col) for per-bed fragment rendering
+- v6: Plant icon resolved at write time and stored in an icon column
+- v7: Numeric planting area columns (area_x, area_y, area_width, area_height)
+- v8: beds table seeded from the 3x3 grid, plants.bed_id with an index, and
+      the plant_areas R*Tree keyed on bed_id
 """
 
 import sqlite3
 import sys
 import os
 
-CURRENT_VERSION = 2
+CURRENT_VERSION = 8
 
 def get_db_path():
     """Get database path from environment or default location"""
@@ -44,9 +52,9 @@ def set_schema_version(cursor, version):
     ''')
     cursor.execute('INSERT INTO schema_version (version) VALUES (?)', (version,))
 
-def migrate():
-    """Run database migrations"""
-    db_path = get_db_path()
+def migrate(db_path=None):
+    """Run database migrations on db_path, or DATABASE_PATH when not given"""
+    db_path = db_path or get_db_path()
     
     if not os.path.exists(db_path):
         print(f"❌ Database not found at {db_path}")
@@ -103,6 +111,142 @@ def migrate():
         migrations_applied += 1
         print("  ✓ Garden bed layout features added")
     
+    # Migration to v4: Typed watering schedule columns
+    if current_version < 4:
+        print("\n📦 Applying v4 migrations (typed watering schedule)...")
+        from app import schedule_fields
+        
+        for column in ('watering_interval_days', 'last_watered_day', 'next_due_day'):
+            if not check_column_exists(cursor, 'plants', column):
+                print(f"  ➜ Adding {column} column...")
+                cursor.execute(f'ALTER TABLE plants ADD COLUMN {column} INTEGER')
+            else:
+                print(f"  ✓ {column} column already exists")
+        
+        print("  ➜ Backfilling schedule columns...")
+        cursor.execute('SELECT id, watering_frequency, last_watered FROM plants')
+        updates = []
+        for plant_id, watering_frequency, last_watered in cursor.fetchall():
+            fields = schedule_fields(watering_frequency, last_watered)
+            updates.append((fields['watering_interval_days'], fields['last_watered_day'],
+                            fields['next_due_day'], plant_id))
+        cursor.executemany(
+            '''UPDATE plants
+               SET watering_interval_days = ?, last_watered_day = ?, next_due_day = ?
+               WHERE id = ?''',
+            updates
+        )
+        print(f"  ✓ Backfilled {len(updates)} plant(s)")
+        
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_plants_next_due ON plants(next_due_day)')
+        print("  ✓ next_due_day index created")
+        
+        set_schema_version(cursor, 4)
+        migrations_applied += 1
+        print("  ✓ Typed watering schedule added")
+    
+    # Migration to v5: Bed position index
+    if current_version < 5:
+        print("\n📦 Applying v5 migrations (bed position index)...")
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_plants_bed ON plants(bed_row, bed_col)')
+        set_schema_version(cursor, 5)
+        migrations_applied += 1
+        print("  ✓ bed_row, bed_col index created")
+    
+    # Migration to v6: Stored plant icons
+    if current_version < 6:
+        print("\n📦 Applying v6 migrations (stored plant icons)...")
+        from app import resolve_plant_icons
+        
+        if not check_column_exists(cursor, 'plants', 'icon'):
+            print("  ➜ Adding icon column...")
+            cursor.execute('ALTER TABLE plants ADD COLUMN icon TEXT')
+        else:
+            print("  ✓ icon column already exists")
+        
+        # Databases from before app_meta existed get it here, not from the app
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS app_meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )
+        ''')
+        
+        print("  ➜ Resolving icons from plant_icons.json...")
+        # Part of the migration's transaction, committed with the schema version
+        types = resolve_plant_icons(conn)
+        print(f"  ✓ Resolved icons for {types} plant type(s)")
+        
+        set_schema_version(cursor, 6)
+        migrations_applied += 1
+        print("  ✓ Stored plant icons added")
+    
+    # Migration to v7: Numeric planting areas and R*Tree
+    if current_version < 7:
+        print("\n📦 Applying v7 migrations (planting area R*Tree)...")
+        from app import area_columns
+        
+        for column in ('area_x', 'area_y', 'area_width', 'area_height'):
+            if not check_column_exists(cursor, 'plants', column):
+                print(f"  ➜ Adding {column} column...")
+                cursor.execute(f'ALTER TABLE plants ADD COLUMN {column} REAL')
+            else:
+                print(f"  ✓ {column} column already exists")
+        
+        print("  ➜ Backfilling planting areas from planting_area JSON...")
+        cursor.execute('SELECT id, planting_area FROM plants')
+        updates = [(*area_columns(planting_area), plant_id) for plant_id, planting_area in cursor.fetchall()]
+        cursor.executemany(
+            'UPDATE plants SET area_x = ?, area_y = ?, area_width = ?, area_height = ? WHERE id = ?',
+            updates
+        )
+        placed = sum(1 for update in updates if update[0] is not None)
+        print(f"  ✓ Backfilled {placed} of {len(updates)} plant(s)")
+        
+        set_schema_version(cursor, 7)
+        migrations_applied += 1
+        print("  ✓ Numeric planting areas added")
+    
+    # Migration to v8: Beds table
+    if current_version < 8:
+        print("\n📦 Applying v8 migrations (beds table)...")
+        from app import create_beds, create_plant_areas
+        
+        print("  ➜ Seeding the original 3x3 layout of 4ft x 8ft beds...")
+        create_beds(conn)
+        
+        if not check_column_exists(cursor, 'plants', 'bed_id'):
+            print("  ➜ Adding bed_id column...")
+            cursor.execute('ALTER TABLE plants ADD COLUMN bed_id INTEGER REFERENCES beds(id)')
+        else:
+            print("  ✓ bed_id column already exists")
+        
+        print("  ➜ Linking plants to their beds...")
+        cursor.execute('''
+            UPDATE plants
+            SET bed_id = (SELECT id FROM beds WHERE grid_row = plants.bed_row AND grid_col = plants.bed_col)
+        ''')
+        cursor.execute('SELECT COUNT(*) FROM plants WHERE bed_id IS NOT NULL')
+        print(f"  ✓ Linked {cursor.fetchone()[0]} plant(s)")
+        
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_plants_bed_id ON plants(bed_id)')
+        cursor.execute('DROP INDEX IF EXISTS idx_plants_bed')
+        print("  ✓ bed_id index replaces the bed_row, bed_col index")
+        
+        print("  ➜ Building plant_areas R*Tree...")
+        cursor.execute('DROP TABLE IF EXISTS plant_areas')
+        for trigger in ('insert', 'update', 'delete'):
+            cursor.execute(f'DROP TRIGGER IF EXISTS plant_areas_{trigger}')
+        create_plant_areas(conn)
+        print("  ✓ plant_areas R*Tree and sync triggers created")
+        
+        # Fragment versions were kept per grid position; they're per bed now
+        cursor.execute("DELETE FROM app_meta WHERE key LIKE 'bed_version:%'")
+        
+        set_schema_version(cursor, 8)
+        migrations_applied += 1
+        print("  ✓ Beds table added")
+    
     conn.commit()
     conn.close()
     
@@ -6,8 +6,8 @@ Version: v3 - Add plant metadata support
 import sqlite3
 import os
 
-def migrate_db():
-    db_path = os.environ.get('DATABASE_PATH', 'data/garden.db')
+def migrate_db(db_path=None):
+    db_path = db_path or os.environ.get('DATABASE_PATH', 'data/garden.db')
 
     # Ensure data directory exists
     os.makedirs(os.path.dirname(db_path) if os.path.dirname(db_path) else 'data', exist_ok=True)
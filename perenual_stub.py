@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Perenual API, served from fixture data
+
+Implements GET /api/species-list?q=... and GET /api/species/details/<id>
+with Perenual's response shapes, so the app can be load-tested and
+exercised offline. Latency, server errors and 429s can be injected; with
+a fixed --seed the same sequence of requests sees the same failures.
+
+Point the app at it with PERENUAL_BASE_URL=http://127.0.0.1:8765/api and
+any PERENUAL_API_KEY.
+
+Usage: python perenual_stub.py [--port 8765] [--latency-ms 50] [--error-rate 0.05]
+"""
+
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'perenual_species.json')
+PAGE_SIZE = 30
+LIST_FIELDS = ('id', 'common_name', 'scientific_name', 'other_name', 'cycle', 'watering', 'sunlight', 'default_image')
+
+def load_fixtures(path):
+    """Species details records from a JSON list, keyed by id"""
+    with open(path, encoding='utf-8') as f:
+        return {record['id']: record for record in json.load(f)}
+
+def matches(record, query):
+    """Perenual-style name search: case-insensitive substring of any name"""
+    names = [record.get('common_name') or ''] + (record.get('scientific_name') or []) + (record.get('other_name') or [])
+    return any(query in name.lower() for name in names)
+
+class StubState:
+    """Fixture data, fault settings and request counters shared by all handler threads"""
+
+    def __init__(self, species, latency_ms=0, jitter_ms=0, error_rate=0.0, throttle_rate=0.0, seed=None):
+        self.species = species
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.random = random.Random(seed)
+        self.counts = {'requests': 0, 'errors': 0, 'throttled': 0}
+        self.lock = threading.Lock()
+
+    def next_fault(self):
+        """Decide this request's fate: (delay seconds, status or None to answer normally)"""
+        with self.lock:
+            self.counts['requests'] += 1
+            delay = (self.latency_ms + self.random.uniform(0, self.jitter_ms)) / 1000
+            roll = self.random.random()
+            if roll < self.throttle_rate:
+                self.counts['throttled'] += 1
+                return delay, 429
+            if roll < self.throttle_rate + self.error_rate:
+                self.counts['errors'] += 1
+                return delay, 500
+            return delay, None
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; don't let Nagle hold the body back
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        state = self.server.state
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+        delay, fault = state.next_fault()
+        if delay:
+            time.sleep(delay)
+        if not params.get('key'):
+            return self.send_json(401, {'message': 'API key required'})
+        if fault == 429:
+            return self.send_json(429, {'message': 'Rate limit exceeded'}, {'Retry-After': '1'})
+        if fault:
+            return self.send_json(fault, {'message': 'Injected server error'})
+
+        parts = url.path.strip('/').split('/')
+        if parts == ['api', 'species-list']:
+            return self.species_list(params)
+        if len(parts) == 4 and parts[:3] == ['api', 'species', 'details'] and parts[3].isdigit():
+            record = state.species.get(int(parts[3]))
+            if record is None:
+                return self.send_json(404, {'message': 'Species not found'})
+            return self.send_json(200, record)
+        return self.send_json(404, {'message': 'Not found'})
+
+    def species_list(self, params):
+        query = params.get('q', '').strip().lower()
+        found = [record for record in self.server.state.species.values() if matches(record, query)]
+        page = params.get('page', '1')
+        page = int(page) if page.isdigit() and int(page) > 0 else 1
+        start = (page - 1) * PAGE_SIZE
+        data = [{field: record.get(field) for field in LIST_FIELDS} for record in found[start:start + PAGE_SIZE]]
+        self.send_json(200, {
+            'data': data,
+            'to': start + len(data),
+            'per_page': PAGE_SIZE,
+            'current_page': page,
+            'from': start + 1 if data else None,
+            'last_page': max((len(found) + PAGE_SIZE - 1) // PAGE_SIZE, 1),
+            'total': len(found),
+        })
+
+    def send_json(self, status, body, headers=None):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        if not self.server.quiet:
+            super().log_message(*args)
+
+def make_server(host='127.0.0.1', port=0, fixtures=DEFAULT_FIXTURES, quiet=True, **faults):
+    """Build a stub server (port 0 picks a free one); call serve_forever() to run it"""
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    server.daemon_threads = True
+    server.state = StubState(load_fixtures(fixtures), **faults)
+    server.quiet = quiet
+    return server
+
+def start_in_thread(**kwargs):
+    """Run a stub server on a background thread and return (server, base_url)"""
+    server = make_server(**kwargs)
+    threading.Thread(target=server.serve_forever, name='perenual-stub', daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f'http://{host}:{port}/api'
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a local stand-in for the Perenual API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES, help='JSON list of species details records')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Delay added to every response')
+    parser.add_argument('--jitter-ms', type=float, default=0, help='Extra random delay of up to this much')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with a 500')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Fraction of requests answered with a 429')
+    parser.add_argument('--seed', type=int, help='Seed for repeatable latency and fault injection')
+    args = parser.parse_args()
+
+    server = make_server(
+        args.host, args.port, args.fixtures, quiet=False,
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate, throttle_rate=args.throttle_rate, seed=args.seed,
+    )
+    print(f'🌿 Perenual stub with {len(server.state.species)} species on http://{args.host}:{args.port}/api')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"📊 {server.state.counts['requests']} requests, {server.state.counts['errors']} errors, "
+              f"{server.state.counts['throttled']} throttled")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Split beds out of a garden database into per-garden shard files
+
+Each --garden GARDEN_ID=BEDS creates GARDENS_DIR/<garden_id>.db with the
+full schema, then copies in the listed beds, their plants and any pending
+enrichment jobs. Ids are kept, so links to /api/plants/<id> still work
+under /gardens/<garden_id>/. A garden given without beds starts empty
+with the default 3x3 layout.
+
+The source database is left as it is unless --move is given, in which
+case the copied beds and plants are deleted from it. Plants with no bed
+always stay behind. Stop the app while splitting.
+
+Usage: python split_gardens.py --garden backyard=1-3 --garden allotment=4,5,6 [--move]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sqlite3
+import sys
+
+import app as garden_app
+import migrate_db
+import migrate_plant_metadata
+
+def parse_garden(spec):
+    """(garden_id, sorted bed ids) from GARDEN_ID=1,2,5-9; no '=' means no beds"""
+    garden_id, _, beds = spec.partition('=')
+    if not garden_app.GARDEN_ID_RE.fullmatch(garden_id) or garden_id == garden_app.DEFAULT_GARDEN:
+        raise argparse.ArgumentTypeError(f'invalid garden id: {garden_id!r}')
+    bed_ids = set()
+    try:
+        for part in filter(None, beds.split(',')):
+            first, _, last = part.partition('-')
+            bed_ids.update(range(int(first), int(last or first) + 1))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'invalid bed list: {beds!r}')
+    return garden_id, sorted(bed_ids)
+
+def create_shard(garden_id):
+    """Create an empty, fully migrated shard for a garden and return its path"""
+    path = garden_app.garden_database(garden_id)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with garden_app.garden_context(garden_id):
+        garden_app.init_db()
+    with contextlib.redirect_stdout(io.StringIO()):
+        migrate_db.migrate(path)
+        migrate_plant_metadata.migrate_db(path)
+    return path
+
+def copy_rows(conn, table, where, params=()):
+    """Copy matching rows of table from the attached source, by the columns both sides have"""
+    source_columns = {row[1] for row in conn.execute(f'PRAGMA source.table_info({table})')}
+    columns = ', '.join(row[1] for row in conn.execute(f'PRAGMA main.table_info({table})') if row[1] in source_columns)
+    return conn.execute(
+        f'INSERT INTO main.{table} ({columns}) SELECT {columns} FROM source.{table} WHERE {where}', params
+    ).rowcount
+
+def split_garden(source, garden_id, bed_ids):
+    """Create one garden's shard and copy its beds into it; returns (plants, jobs) copied"""
+    path = create_shard(garden_id)
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute('ATTACH DATABASE ? AS source', (source,))
+        if not bed_ids:
+            conn.commit()
+            return 0, 0
+        # Migration seeded the default layout; the garden gets its own beds instead
+        conn.execute('DELETE FROM main.beds')
+        marks = ', '.join('?' * len(bed_ids))
+        copy_rows(conn, 'beds', f'id IN ({marks})', bed_ids)
+        plants = copy_rows(conn, 'plants', f'bed_id IN ({marks})', bed_ids)
+        jobs = copy_rows(conn, 'enrichment_jobs', 'plant_id IN (SELECT id FROM main.plants)')
+        conn.commit()
+        return plants, jobs
+    finally:
+        conn.close()
+
+def remove_moved(source, bed_ids):
+    """Delete moved beds and everything in them from the source database"""
+    conn = sqlite3.connect(source)
+    marks = ', '.join('?' * len(bed_ids))
+    conn.execute(
+        f'DELETE FROM enrichment_jobs WHERE plant_id IN (SELECT id FROM plants WHERE bed_id IN ({marks}))', bed_ids
+    )
+    plants = conn.execute(f'DELETE FROM plants WHERE bed_id IN ({marks})', bed_ids).rowcount
+    conn.execute(f'DELETE FROM beds WHERE id IN ({marks})', bed_ids)
+    # New revision in the same transaction, so dashboards polled before the split don't get 304s
+    garden_app.record_plant_write(conn, *bed_ids)
+    conn.commit()
+    conn.close()
+    return plants
+
+def main():
+    parser = argparse.ArgumentParser(description='Split beds out of a garden database into per-garden shards')
+    parser.add_argument('--garden', action='append', type=parse_garden, required=True,
+                        metavar='GARDEN_ID=BEDS', help='Garden id and the bed ids it takes, e.g. backyard=1-3,7')
+    parser.add_argument('--gardens-dir', help='Where shard files go (default: GARDENS_DIR, or gardens/ beside the database)')
+    parser.add_argument('--move', action='store_true', help='Delete the copied beds and plants from the source')
+    args = parser.parse_args()
+
+    source = migrate_db.get_db_path()
+    if not os.path.exists(source):
+        print(f"❌ Database not found at {source}")
+        sys.exit(1)
+    garden_app.app.config['DATABASE'] = source
+    garden_app.app.config['GARDENS_DIR'] = (
+        args.gardens_dir or os.environ.get('GARDENS_DIR') or os.path.join(os.path.dirname(source), 'gardens')
+    )
+
+    conn = sqlite3.connect(source)
+    known_beds = {row[0] for row in conn.execute('SELECT id FROM beds')}
+    conn.close()
+    assigned = {}
+    for garden_id, bed_ids in args.garden:
+        if os.path.exists(garden_app.garden_database(garden_id)):
+            parser.error(f'garden {garden_id} already has a shard at {garden_app.garden_database(garden_id)}')
+        for bed_id in bed_ids:
+            if bed_id not in known_beds:
+                parser.error(f'bed {bed_id} does not exist in {source}')
+            if bed_id in assigned:
+                parser.error(f'bed {bed_id} is given to both {assigned[bed_id]} and {garden_id}')
+            assigned[bed_id] = garden_id
+
+    print(f"🔀 Splitting {source} into {garden_app.app.config['GARDENS_DIR']}")
+    for garden_id, bed_ids in args.garden:
+        plants, jobs = split_garden(source, garden_id, bed_ids)
+        print(f"  ✓ {garden_id}: {len(bed_ids) or 'default'} bed(s), {plants} plant(s), {jobs} enrichment job(s)")
+
+    if args.move and assigned:
+        print("  ➜ Removing moved beds from the source...")
+        removed = remove_moved(source, sorted(assigned))
+        print(f"  ✓ Removed {len(assigned)} bed(s) and {removed} plant(s)")
+
+    print("\n✅ Split complete! Each garden is served under /gardens/<garden_id>/")
+
+if __name__ == '__main__':
+    main()
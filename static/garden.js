@@ -0,0 +1,573 @@
+// Plant, bed, event and weather routes for this page's garden; empty for the default garden
+const API_BASE = document.body.dataset.apiBase || '';
+let selectedBedId = null;
+let isDrawing = false;
+let startX, startY;
+
+// Planting map drawing functionality
+function setupPlantingMap() {
+    const map = document.getElementById('plantingMap');
+    const svg = document.getElementById('plantingSvg');
+    const rect = document.getElementById('plantedRect');
+    
+    function getRelativeCoords(e) {
+        const bounds = svg.getBoundingClientRect();
+        const x = ((e.clientX || e.touches[0].clientX) - bounds.left) / bounds.width * 100;
+        const y = ((e.clientY || e.touches[0].clientY) - bounds.top) / bounds.height * 100;
+        return { x: Math.max(0, Math.min(100, x)), y: Math.max(0, Math.min(100, y)) };
+    }
+    
+    function startDrawing(e) {
+        isDrawing = true;
+        const coords = getRelativeCoords(e);
+        startX = coords.x;
+        startY = coords.y;
+        rect.setAttribute('x', startX + '%');
+        rect.setAttribute('y', startY + '%');
+        rect.setAttribute('width', '0%');
+        rect.setAttribute('height', '0%');
+        rect.style.display = 'block';
+        e.preventDefault();
+    }
+    
+    function draw(e) {
+        if (!isDrawing) return;
+        const coords = getRelativeCoords(e);
+        const width = Math.abs(coords.x - startX);
+        const height = Math.abs(coords.y - startY);
+        const x = Math.min(startX, coords.x);
+        const y = Math.min(startY, coords.y);
+        
+        rect.setAttribute('x', x + '%');
+        rect.setAttribute('y', y + '%');
+        rect.setAttribute('width', width + '%');
+        rect.setAttribute('height', height + '%');
+        e.preventDefault();
+    }
+    
+    function stopDrawing(e) {
+        if (isDrawing) {
+            isDrawing = false;
+            // Save the planting area coordinates
+            const x = parseFloat(rect.getAttribute('x'));
+            const y = parseFloat(rect.getAttribute('y'));
+            const width = parseFloat(rect.getAttribute('width'));
+            const height = parseFloat(rect.getAttribute('height'));
+            
+            if (width > 0 && height > 0) {
+                document.getElementById('plantingArea').value = JSON.stringify({
+                    x: x, y: y, width: width, height: height
+                });
+            }
+        }
+    }
+    
+    // Mouse events
+    svg.addEventListener('mousedown', startDrawing);
+    svg.addEventListener('mousemove', draw);
+    svg.addEventListener('mouseup', stopDrawing);
+    svg.addEventListener('mouseleave', stopDrawing);
+    
+    // Touch events for mobile
+    svg.addEventListener('touchstart', startDrawing);
+    svg.addEventListener('touchmove', draw);
+    svg.addEventListener('touchend', stopDrawing);
+}
+
+// One option per bed on the page, in layout order
+function createBedSelector() {
+    const selector = document.getElementById('bedSelector');
+    selector.innerHTML = '';
+
+    document.querySelectorAll('.garden-layout .garden-bed').forEach(bed => {
+        const option = document.createElement('div');
+        option.className = 'bed-option';
+        option.dataset.bedId = bed.dataset.bedId;
+        const label = document.createElement('strong');
+        label.textContent = bed.dataset.bedName;
+        option.appendChild(label);
+        option.onclick = () => selectBed(bed.dataset.bedId);
+        selector.appendChild(option);
+    });
+}
+
+function selectBed(bedId) {
+    const element = document.querySelector(`.bed-option[data-bed-id="${bedId}"]`);
+    if (!element) return;
+    document.querySelectorAll('.bed-option').forEach(el => el.classList.remove('selected'));
+    element.classList.add('selected');
+    selectedBedId = bedId;
+    document.getElementById('bedId').value = bedId;
+}
+
+function openModal() {
+    createBedSelector();
+    selectedBedId = null;
+    document.getElementById('plantedRect').style.display = 'none';
+    document.getElementById('plantingArea').value = '';
+    document.getElementById('addPlantModal').style.display = 'block';
+    document.querySelector('.modal h2').textContent = 'Add New Plant';
+
+    // Reset form submission to add mode
+    const form = document.getElementById('addPlantForm');
+    form.onsubmit = async (e) => {
+        e.preventDefault();
+        const formData = new FormData(e.target);
+        const data = Object.fromEntries(formData);
+
+        const response = await fetch(`${API_BASE}/api/plants`, {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify(data)
+        });
+
+        if (response.ok) {
+            applyPlantUpdate(await response.json());
+            closeModal();
+        } else if (response.status === 409) {
+            // Planting area overlaps another plant; keep the modal open to redraw it
+            alert((await response.json()).error);
+        }
+    };
+
+    setTimeout(setupPlantingMap, 100);
+}
+
+function openModalForBed(bedId) {
+    openModal();
+    selectBed(bedId);
+}
+
+function closeModal() {
+    document.getElementById('addPlantModal').style.display = 'none';
+    document.getElementById('addPlantForm').reset();
+}
+
+async function waterPlant(id) {
+    const response = await fetch(`${API_BASE}/api/plants/${id}/water`, {
+        method: 'POST'
+    });
+    if (response.ok) {
+        applyPlantUpdate(await response.json());
+    }
+}
+
+// Revision the page was rendered at, and the newest revision applied to each plant and bed since
+const pageRevision = Number(document.body.dataset.revision);
+const appliedRevisions = {};
+
+function isNewer(key, revision) {
+    if ((appliedRevisions[key] ?? pageRevision) >= revision) {
+        return false;
+    }
+    appliedRevisions[key] = revision;
+    return true;
+}
+
+// Patch the page from a mutation response or change event instead of reloading it
+function applyPlantUpdate(update) {
+    if (isNewer(`plant-${update.plant_id}`, update.revision)) {
+        patchPlant(update);
+    }
+
+    update.beds.forEach(bed => {
+        const bedElement = document.getElementById(`bed-${bed.id}`);
+        if (bedElement && isNewer(`bed-${bed.id}`, update.revision)) {
+            bedElement.outerHTML = bed.html;
+        }
+    });
+
+    applyDisplaySettings();
+}
+
+function patchPlant(update) {
+    const card = document.getElementById(`plant-card-${update.plant_id}`);
+    if (update.card_html) {
+        if (card) {
+            card.outerHTML = update.card_html;
+        } else {
+            // New plants have the highest id, and cards are listed newest first
+            document.getElementById('plants-container').insertAdjacentHTML('afterbegin', update.card_html);
+        }
+    } else if (card) {
+        card.remove();
+    }
+    document.getElementById('plants-empty').classList.toggle(
+        'hidden', document.querySelector('.plant-card') !== null
+    );
+
+    const scheduleList = document.getElementById('schedule-list');
+    const scheduleItem = document.getElementById(`schedule-item-${update.plant_id}`);
+    if (scheduleItem) {
+        scheduleItem.remove();
+    }
+    if (update.schedule_html) {
+        const due = update.schedule_entry.next_due_day;
+        const next = Array.from(scheduleList.children).find(item => {
+            const itemDue = item.dataset.nextDue === '' ? null : Number(item.dataset.nextDue);
+            return scheduleSortsBefore(due, update.plant_id, itemDue, Number(item.id.split('-').pop()));
+        });
+        if (next) {
+            next.insertAdjacentHTML('beforebegin', update.schedule_html);
+        } else {
+            scheduleList.insertAdjacentHTML('beforeend', update.schedule_html);
+        }
+    }
+    document.getElementById('schedule-empty').classList.toggle(
+        'hidden', scheduleList.children.length > 0
+    );
+}
+
+// Live updates from everyone else looking at the garden
+function subscribeToPlantEvents() {
+    const events = new EventSource(`${API_BASE}/api/events?since=${pageRevision}`);
+    ['created', 'updated', 'watered', 'deleted', 'enriched'].forEach(type => {
+        events.addEventListener(type, e => applyPlantUpdate(JSON.parse(e.data)));
+    });
+    // Too far behind for the server to replay what we missed
+    events.addEventListener('reset', () => window.location.reload());
+}
+
+subscribeToPlantEvents();
+
+// Mirrors the order watering_schedule.schedule_many gives the server's schedule:
+// never-watered plants first, then by rain-adjusted next_due_day, then id
+function scheduleSortsBefore(due, id, otherDue, otherId) {
+    if (due !== otherDue) {
+        if (due === null) return true;
+        if (otherDue === null) return false;
+        return due < otherDue;
+    }
+    return id < otherId;
+}
+
+async function editPlant(id) {
+    // Fetch the plant data
+    const response = await fetch(`${API_BASE}/api/plants/${id}`);
+    const plant = await response.json();
+
+    // Populate the form with existing data
+    openModal();
+    document.querySelector('input[name="name"]').value = plant.name || '';
+    document.querySelector('input[name="type"]').value = plant.type || '';
+    document.querySelector('input[name="planted_date"]').value = plant.planted_date || '';
+    document.querySelector('input[name="watering_frequency"]').value = plant.watering_frequency || '';
+
+    // Select the correct bed
+    if (plant.bed_id !== null) {
+        selectBed(plant.bed_id);
+    }
+
+    // Draw existing planting area if it exists
+    if (plant.planting_area) {
+        try {
+            const area = JSON.parse(plant.planting_area);
+            const rect = document.getElementById('plantedRect');
+            rect.setAttribute('x', area.x + '%');
+            rect.setAttribute('y', area.y + '%');
+            rect.setAttribute('width', area.width + '%');
+            rect.setAttribute('height', area.height + '%');
+            rect.style.display = 'block';
+            document.getElementById('plantingArea').value = plant.planting_area;
+        } catch (e) {}
+    }
+
+    // Change the modal title and form behavior for editing
+    document.querySelector('.modal h2').textContent = 'Edit Plant';
+    const form = document.getElementById('addPlantForm');
+    form.onsubmit = async (e) => {
+        e.preventDefault();
+        const formData = new FormData(e.target);
+        const data = Object.fromEntries(formData);
+
+        const response = await fetch(`${API_BASE}/api/plants/${id}`, {
+            method: 'PUT',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify(data)
+        });
+
+        if (response.ok) {
+            applyPlantUpdate(await response.json());
+            closeModal();
+        } else if (response.status === 409) {
+            // Planting area overlaps another plant; keep the modal open to redraw it
+            alert((await response.json()).error);
+        }
+    };
+}
+
+async function deletePlant(id) {
+    if (confirm('Are you sure you want to delete this plant?')) {
+        const response = await fetch(`${API_BASE}/api/plants/${id}`, {
+            method: 'DELETE'
+        });
+        if (response.ok) {
+            applyPlantUpdate(await response.json());
+        }
+    }
+}
+
+// Tab switching
+function switchTab(tabName) {
+    // Hide all tab contents
+    document.querySelectorAll('.tab-content').forEach(content => {
+        content.classList.remove('active');
+    });
+
+    // Remove active class from all tabs
+    document.querySelectorAll('.tab').forEach(tab => {
+        tab.classList.remove('active');
+    });
+
+    // Show selected tab content
+    if (tabName === 'garden') {
+        document.getElementById('garden-tab').classList.add('active');
+        document.querySelectorAll('.tab')[0].classList.add('active');
+    } else if (tabName === 'schedule') {
+        document.getElementById('schedule-tab').classList.add('active');
+        document.querySelectorAll('.tab')[1].classList.add('active');
+    }
+}
+
+// Weather functionality
+async function fetchWeather() {
+    try {
+        // The server fetches Open-Meteo once per refresh interval for everyone;
+        // the browser revalidates its copy with the ETag
+        const response = await fetch(`${API_BASE}/api/weather`);
+        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+
+        const data = await response.json();
+        const current = data.current;
+
+        // Weather code to emoji and description mapping
+        const weatherCodeMap = {
+            0: { emoji: '☀️', desc: 'Clear sky' },
+            1: { emoji: '🌤️', desc: 'Mainly clear' },
+            2: { emoji: '⛅', desc: 'Partly cloudy' },
+            3: { emoji: '☁️', desc: 'Overcast' },
+            45: { emoji: '🌫️', desc: 'Foggy' },
+            48: { emoji: '🌫️', desc: 'Foggy' },
+            51: { emoji: '🌦️', desc: 'Light drizzle' },
+            53: { emoji: '🌦️', desc: 'Moderate drizzle' },
+            55: { emoji: '🌧️', desc: 'Heavy drizzle' },
+            61: { emoji: '🌧️', desc: 'Light rain' },
+            63: { emoji: '🌧️', desc: 'Moderate rain' },
+            65: { emoji: '🌧️', desc: 'Heavy rain' },
+            71: { emoji: '🌨️', desc: 'Light snow' },
+            73: { emoji: '🌨️', desc: 'Moderate snow' },
+            75: { emoji: '🌨️', desc: 'Heavy snow' },
+            77: { emoji: '🌨️', desc: 'Snow grains' },
+            80: { emoji: '🌦️', desc: 'Light showers' },
+            81: { emoji: '🌧️', desc: 'Moderate showers' },
+            82: { emoji: '🌧️', desc: 'Heavy showers' },
+            85: { emoji: '🌨️', desc: 'Light snow showers' },
+            86: { emoji: '🌨️', desc: 'Heavy snow showers' },
+            95: { emoji: '⛈️', desc: 'Thunderstorm' },
+            96: { emoji: '⛈️', desc: 'Thunderstorm with hail' },
+            99: { emoji: '⛈️', desc: 'Thunderstorm with hail' }
+        };
+
+        const weather = weatherCodeMap[current.weather_code] || { emoji: '🌤️', desc: 'Unknown' };
+
+        document.getElementById('weatherWidget').innerHTML = `
+            <div class="weather-header">
+                <div class="weather-location">
+                    📍 ${data.location || `${data.latitude}, ${data.longitude}`}
+                </div>
+                <div style="font-size: 0.9em; opacity: 0.9;">
+                    ${new Date().toLocaleDateString('en-US', { weekday: 'short', month: 'short', day: 'numeric' })}
+                </div>
+            </div>
+            <div class="weather-main">
+                <div>
+                    <div class="weather-temp">${Math.round(current.temperature_2m)}°F</div>
+                    <div class="weather-description">${weather.desc}</div>
+                    <div style="font-size: 0.9em; opacity: 0.9; margin-top: 5px;">
+                        Feels like ${Math.round(current.apparent_temperature)}°F
+                    </div>
+                </div>
+                <div class="weather-icon">${weather.emoji}</div>
+            </div>
+            <div class="weather-details">
+                <div class="weather-detail-item">
+                    <div class="weather-detail-label">💧 Humidity</div>
+                    <div class="weather-detail-value">${current.relative_humidity_2m}%</div>
+                </div>
+                <div class="weather-detail-item">
+                    <div class="weather-detail-label">💨 Wind</div>
+                    <div class="weather-detail-value">${Math.round(current.wind_speed_10m)} mph</div>
+                </div>
+                <div class="weather-detail-item">
+                    <div class="weather-detail-label">🌧️ Rain</div>
+                    <div class="weather-detail-value">${current.precipitation}" /hr</div>
+                </div>
+            </div>
+        `;
+    } catch (error) {
+        console.error('Weather fetch error:', error);
+        document.getElementById('weatherWidget').innerHTML = `
+            <div class="weather-loading">⚠️ Unable to load weather data</div>
+        `;
+    }
+}
+
+// Fetch weather on page load
+fetchWeather();
+
+// Refresh weather every 10 minutes
+setInterval(fetchWeather, 600000);
+
+// Plant lookup functionality
+async function openPlantLookup() {
+    const plantName = document.getElementById('plantName').value;
+    const plantVariety = document.getElementById('plantVariety').value;
+    const searchTerm = plantVariety || plantName;
+
+    if (!searchTerm) {
+        alert('Please enter a plant name or variety first');
+        return;
+    }
+
+    const resultsDiv = document.getElementById('plantSearchResults');
+    resultsDiv.innerHTML = '<div style="padding: 15px; text-align: center;">🔍 Searching...</div>';
+    resultsDiv.style.display = 'block';
+
+    try {
+        const response = await fetch(`/api/plants/search?q=${encodeURIComponent(searchTerm)}`);
+        const data = await response.json();
+
+        if (data.error) {
+            resultsDiv.innerHTML = `<div style="padding: 15px; color: #ef4444;">${data.error}</div>`;
+            return;
+        }
+
+        if (!data.results || data.results.length === 0) {
+            resultsDiv.innerHTML = '<div style="padding: 15px;">No plants found. Try a different search term.</div>';
+            return;
+        }
+
+        resultsDiv.innerHTML = data.results.map(plant => `
+            <div class="plant-search-result" onclick='selectPlant(${plant.id}, ${JSON.stringify(plant.common_name)}, ${JSON.stringify(plant.watering || null)})' style="padding: 12px; border-bottom: 1px solid #e5e7eb; cursor: pointer; display: flex; align-items: center; gap: 12px;">
+                ${plant.image ? `<img src="${plant.image}" style="width: 50px; height: 50px; border-radius: 8px; object-fit: cover;">` : '<div style="width: 50px; height: 50px; background: #f3f4f6; border-radius: 8px; display: flex; align-items: center; justify-content: center;">🌱</div>'}
+                <div style="flex: 1;">
+                    <div style="font-weight: 600; color: #16a34a;">${plant.common_name}</div>
+                    ${plant.scientific_name ? `<div style="font-size: 0.85em; color: #6b7280; font-style: italic;">${plant.scientific_name}</div>` : ''}
+                    <div style="font-size: 0.85em; color: #6b7280; margin-top: 4px;">
+                        ${plant.sunlight ? `☀️ ${plant.sunlight}` : ''}
+                        ${plant.watering ? `💧 ${plant.watering}` : ''}
+                    </div>
+                </div>
+            </div>
+        `).join('');
+    } catch (error) {
+        resultsDiv.innerHTML = `<div style="padding: 15px; color: #ef4444;">Error: ${error.message}</div>`;
+    }
+}
+
+// Perenual rates watering as a level; the server only schedules a day count
+const PERENUAL_WATERING_FREQUENCIES = {
+    frequent: 'Every 3 days',
+    average: 'Every 7 days',
+    minimum: 'Every 14 days',
+};
+
+function selectPlant(perenualId, commonName, watering) {
+    const resultsDiv = document.getElementById('plantSearchResults');
+
+    // Populate the variety field with the common name
+    document.getElementById('plantVariety').value = commonName || '';
+
+    // Without a frequency the plant never makes the watering schedule, so suggest one
+    const frequency = document.querySelector('input[name="watering_frequency"]');
+    if (watering && !frequency.value) {
+        frequency.value = PERENUAL_WATERING_FREQUENCIES[watering.toLowerCase()] || watering;
+    }
+
+    // The server looks up the rest of the metadata in the background after saving
+    ['scientificName', 'sunlight', 'wateringNeeds', 'cycle', 'hardinessZones', 'description'].forEach(id => {
+        document.getElementById(id).value = '';
+    });
+    document.getElementById('perenualId').value = perenualId;
+
+    resultsDiv.innerHTML = '<div style="padding: 15px; background: #dcfce7; color: #16a34a; border-radius: 8px;">✅ Plant selected! Its details will be added after you save.</div>';
+    setTimeout(() => {
+        resultsDiv.style.display = 'none';
+    }, 3000);
+}
+
+// Settings functionality
+function loadDisplaySettings() {
+    const settings = JSON.parse(localStorage.getItem('plantDisplaySettings') || '{"showScientificName":true,"showSunlight":true,"showCycle":true,"showHardinessZones":true}');
+
+    document.getElementById('showScientificName').checked = settings.showScientificName;
+    document.getElementById('showSunlight').checked = settings.showSunlight;
+    document.getElementById('showCycle').checked = settings.showCycle;
+    document.getElementById('showHardinessZones').checked = settings.showHardinessZones;
+
+    return settings;
+}
+
+function saveDisplaySettings() {
+    const settings = {
+        showScientificName: document.getElementById('showScientificName').checked,
+        showSunlight: document.getElementById('showSunlight').checked,
+        showCycle: document.getElementById('showCycle').checked,
+        showHardinessZones: document.getElementById('showHardinessZones').checked
+    };
+    localStorage.setItem('plantDisplaySettings', JSON.stringify(settings));
+
+    // Reload page to apply new settings
+    window.location.reload();
+}
+
+function openSettingsModal() {
+    loadDisplaySettings();
+    document.getElementById('settingsModal').style.display = 'block';
+}
+
+function closeSettingsModal() {
+    document.getElementById('settingsModal').style.display = 'none';
+}
+
+// Load settings on page load and apply them
+const displaySettings = loadDisplaySettings();
+
+// Apply display settings to plant cards
+function applyDisplaySettings() {
+    const settings = loadDisplaySettings();
+
+    // Toggle scientific name
+    document.querySelectorAll('.plant-metadata-scientific-name').forEach(el => {
+        el.classList.toggle('hidden', !settings.showScientificName);
+    });
+
+    // Toggle sunlight
+    document.querySelectorAll('.plant-metadata-sunlight').forEach(el => {
+        el.classList.toggle('hidden', !settings.showSunlight);
+    });
+
+    // Toggle cycle
+    document.querySelectorAll('.plant-metadata-cycle').forEach(el => {
+        el.classList.toggle('hidden', !settings.showCycle);
+    });
+
+    // Toggle hardiness zones
+    document.querySelectorAll('.plant-metadata-hardiness').forEach(el => {
+        el.classList.toggle('hidden', !settings.showHardinessZones);
+    });
+}
+
+// Apply settings on page load
+applyDisplaySettings();
+
+// Close modal when clicking outside
+window.onclick = function(event) {
+    const addModal = document.getElementById('addPlantModal');
+    const settingsModal = document.getElementById('settingsModal');
+    if (event.target == addModal) {
+        closeModal();
+    } else if (event.target == settingsModal) {
+        closeSettingsModal();
+    }
+}
@@ -0,0 +1,133 @@
+"""
+Watering schedule rules, for one plant or a whole garden at once
+
+Days are date ordinals. A plant with no last watering counts as 999 days
+dry and sorts first; otherwise plants sort by next due day, then id.
+Rain days are sorted (day, inches) pairs that count as a watering (see
+rain_credit).
+
+schedule_many() computes every plant in one pass. With NumPy installed it
+works on whole columns at once; without it, it falls back to a plain loop
+over the same rules.
+"""
+
+from collections import namedtuple
+
+try:
+    import numpy as np
+except ImportError:  # optional: only makes big gardens faster
+    np = None
+
+NEVER_WATERED_DAYS = 999
+
+def classify(days_since, interval):
+    """(status, status text) for a plant watered days_since days ago"""
+    days_until = interval - days_since
+    if days_since >= interval:
+        days_overdue = days_since - interval
+        if days_overdue == 0:
+            return 'overdue', 'Water Today (Due)'
+        if days_overdue == 1:
+            return 'overdue', 'Overdue by 1 day'
+        return 'overdue', f'Overdue by {days_overdue} days'
+    if days_until == 1:
+        return 'today', 'Water Today'
+    return 'upcoming', f'Water in {days_until} days'
+
+def rain_credit(last_day, interval, rain_days, today_day):
+    """(effective last-watered day, inches credited) when rain stands in for watering, else None.
+
+    A rain day counts if it falls after the last watering (real or rain) and
+    no later than the day that watering would come due, or today for plants
+    already overdue. Forecast rain on or before the due day pushes the due
+    date out just as past rain does.
+    """
+    if last_day is None or interval is None or not rain_days:
+        return None
+    effective, credited = last_day, 0.0
+    for day, inches in rain_days:
+        if day <= effective:
+            continue
+        if day > max(effective + interval, today_day):
+            break
+        effective, credited = day, credited + inches
+    return (effective, credited) if effective != last_day else None
+
+def schedule_one(interval, last_day, today_day, rain_days=()):
+    """(effective last day, next due day, days since, status, status text, rain inches) for one plant"""
+    rain_inches = None
+    credit = rain_credit(last_day, interval, rain_days, today_day)
+    if credit is not None:
+        last_day, rain_inches = credit
+    if last_day is None:
+        days_since, next_due = NEVER_WATERED_DAYS, None
+    else:
+        days_since, next_due = today_day - last_day, last_day + interval
+    status, text = classify(days_since, interval)
+    return last_day, next_due, days_since, status, text, rain_inches
+
+class ScheduleBatch(namedtuple('ScheduleBatch', 'order last_day next_due days_since status status_text rain_inches')):
+    """schedule_many() output: plant indexes most urgent first, plus one list per schedule_one() field"""
+
+    def result(self, i):
+        """schedule_one()'s tuple for plant i"""
+        return (self.last_day[i], self.next_due[i], self.days_since[i],
+                self.status[i], self.status_text[i], self.rain_inches[i])
+
+def schedule_many(ids, intervals, last_days, today_day, rain_days=(), use_numpy=None):
+    """Schedule every plant at once; last_days may contain None"""
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy and len(ids):
+        return _schedule_numpy(ids, intervals, last_days, today_day, rain_days)
+    results = [schedule_one(interval, last_day, today_day, rain_days) for interval, last_day in zip(intervals, last_days)]
+    order = sorted(
+        range(len(results)),
+        key=lambda i: (results[i][1] is not None, results[i][1] or 0, ids[i])
+    )
+    return ScheduleBatch(order, *(list(column) for column in zip(*results))) if results else ScheduleBatch([], *[[]] * 6)
+
+def _schedule_numpy(ids, intervals, last_days, today_day, rain_days):
+    ids = np.asarray(ids, dtype=np.int64)
+    interval = np.asarray(intervals, dtype=np.int64)
+    # None reads in as NaN in a float array, which is far quicker than testing each value
+    last = np.array(last_days, dtype=np.float64)
+    watered = ~np.isnan(last)
+    original = np.where(watered, last, 0).astype(np.int64)
+
+    # Same walk as rain_credit, one rain day at a time across every plant;
+    # once a day is out of reach for a plant, every later one is too
+    effective = original.copy()
+    credited = np.zeros(len(effective))
+    for day, inches in rain_days:
+        reach = np.maximum(effective + interval, today_day)
+        hit = watered & (day > effective) & (day <= reach)
+        effective[hit] = day
+        credited[hit] += inches
+    rained = effective != original
+
+    days_since = np.where(watered, today_day - effective, NEVER_WATERED_DAYS)
+    next_due = effective + interval
+    days_overdue = days_since - interval
+    status = np.select([days_overdue >= 0, days_overdue == -1], ['overdue', 'today'], 'upcoming')
+
+    # The text depends only on days overdue, so format each distinct value once
+    distinct, inverse = np.unique(days_overdue, return_inverse=True)
+    texts = np.asarray([classify(int(d), 0)[1] for d in distinct], dtype=object)
+    status_text = texts[inverse.reshape(-1)]
+
+    # Never-watered plants first, then by due day, then id
+    order = np.lexsort((ids, np.where(watered, next_due, 0), watered))
+
+    # Object columns so missing values come back as None
+    effective = effective.astype(object)
+    next_due = next_due.astype(object)
+    effective[~watered] = None
+    next_due[~watered] = None
+    rain_inches = np.full(len(credited), None, dtype=object)
+    rain_inches[rained] = credited[rained]
+
+    return ScheduleBatch(
+        order.tolist(), effective.tolist(), next_due.tolist(), days_since.tolist(),
+        status.tolist(), status_text.tolist(), rain_inches.tolist(),
+    )